@@ -0,0 +1,182 @@
+"""
+Load test comparing DB_MODE=sync and DB_MODE=async.
+
+Seeds a throwaway SQLite database, starts uvicorn once per mode against it
+and hammers the read endpoints with concurrent clients, then prints
+throughput and latency percentiles for each mode. The response cache is
+disabled so every request reaches the database.
+
+Usage (from the project root):
+    python backend/benchmarks/load_test.py --concurrency 100 --duration 15
+    python backend/benchmarks/load_test.py --database-url postgresql://...  # existing, seeded DB
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(database_url: str, unions: int, posts_per_union: int) -> None:
+    """Fill a fresh database with unions, posts, comments, events and polls."""
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, PROJECT_ROOT)
+    from datetime import datetime, timedelta
+    from backend.db import Base, SessionLocal, engine
+    from backend import models
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        users = [models.User(username=f"loaduser{i}", hashed_password="x", role="member") for i in range(20)]
+        db.add_all(users)
+        db.flush()
+        now = datetime.utcnow()
+        for u in range(unions):
+            union = models.Union(name=f"Load Union {u}", description="Load test union", industry="Testing")
+            db.add(union)
+            db.flush()
+            db.add_all(models.UnionMember(union_id=union.id, user_id=user.id) for user in users[: u % len(users) + 1])
+            for p in range(posts_per_union):
+                post = models.Post(title=f"Post {p}", content="Load test content " * 10, union_id=union.id)
+                db.add(post)
+                db.flush()
+                db.add_all(
+                    models.Comment(content=f"Comment {c}", post_id=post.id, user_id=users[c % len(users)].id)
+                    for c in range(3)
+                )
+            event = models.Event(title=f"Event {u}", start_time=now + timedelta(days=u), union_id=union.id, creator_id=users[0].id)
+            db.add(event)
+            db.flush()
+            db.add_all(models.EventAttendee(event_id=event.id, user_id=user.id) for user in users[:5])
+            poll = models.Poll(question=f"Poll {u}?", union_id=union.id)
+            db.add(poll)
+            db.flush()
+            options = [models.PollOption(poll_id=poll.id, text=text) for text in ("Yes", "No")]
+            db.add_all(options)
+            db.flush()
+            db.add_all(
+                models.Vote(poll_id=poll.id, option_id=options[i % 2].id, user_id=user.id)
+                for i, user in enumerate(users)
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def start_server(mode: str, database_url: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DB_MODE=mode, DATABASE_URL=database_url, RESPONSE_CACHE_TTL="0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"server for DB_MODE={mode} did not start")
+
+
+async def run_load(base_url: str, paths, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(offset: int):
+        nonlocal errors
+        i = offset
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unions", type=int, default=20)
+    parser.add_argument("--posts-per-union", type=int, default=25)
+    parser.add_argument("--database-url", help="use an existing, already seeded database")
+    args = parser.parse_args()
+
+    tmpdir = None
+    database_url = args.database_url
+    if not database_url:
+        tmpdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(tmpdir.name, 'load_test.db')}"
+        print(f"Seeding {args.unions} unions x {args.posts_per_union} posts...")
+        seed(database_url, args.unions, args.posts_per_union)
+
+    paths = ["/api/unions/", "/api/events/", "/api/polls/", "/api/unions/1"]
+    paths += [f"/api/posts/union/{u}?limit=20" for u in range(1, 6)]
+    paths += [f"/api/polls/{p}/results" for p in range(1, 6)]
+
+    results = {}
+    for mode in args.modes.split(","):
+        server = start_server(mode, database_url, args.port, args.workers)
+        try:
+            print(f"DB_MODE={mode}: {args.concurrency} clients for {args.duration:g}s...")
+            results[mode] = asyncio.run(run_load(f"http://127.0.0.1:{args.port}", paths, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print()
+    print(f"{'mode':<8}{'requests':>10}{'errors':>8}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<8}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}{r['mean_ms']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+        )
+
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Poll results on a high-turnout poll: time and peak Python memory.
+
+Seeds a poll with --votes votes (1M by default) spread over four options in
+a throwaway SQLite database, then tallies it with routes.polls._poll_results
+and reports wall time and the peak memory allocated by Python (tracemalloc)
+while doing so. Exits non-zero if the peak exceeds --max-memory-kb: the
+tally is computed in SQL, so memory must not grow with the number of votes.
+
+--legacy also measures the old approach (load every Vote row and count
+them with collections.Counter) for comparison; it needs a lot of memory.
+
+Usage (from the project root):
+    python backend/benchmarks/poll_results.py
+    python backend/benchmarks/poll_results.py --votes 200000 --legacy
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.db import Base  # noqa: E402
+from backend import models  # noqa: E402
+from backend.routes.polls import _poll_results  # noqa: E402
+from backend.sqlite_tuning import configure_sqlite, sqlite_pragmas  # noqa: E402
+
+CHUNK = 50_000
+
+
+def seed(engine, votes: int) -> int:
+    with Session(engine) as db:
+        poll = models.Poll(question="Ratify the contract?", options=[
+            models.PollOption(text=text) for text in ("Yes", "No", "Abstain", "Undecided")
+        ])
+        db.add(poll)
+        db.commit()
+        poll_id, option_ids = poll.id, [o.id for o in poll.options]
+
+    # Voters need not exist as users for the tally; foreign keys are off here
+    with engine.begin() as connection:
+        for start in range(0, votes, CHUNK):
+            connection.execute(insert(models.Vote.__table__), [
+                {"poll_id": poll_id, "option_id": option_ids[(n * 7) % 10 % 4], "user_id": n + 1}
+                for n in range(start, min(start + CHUNK, votes))
+            ])
+    return poll_id
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def legacy_results(db: Session, poll_id: int) -> dict:
+    votes = db.query(models.Vote).filter(models.Vote.poll_id == poll_id).all()
+    return Counter(v.option_id for v in votes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--votes", type=int, default=1_000_000)
+    parser.add_argument("--max-memory-kb", type=int, default=1024)
+    parser.add_argument("--legacy", action="store_true", help="also measure the load-every-vote approach")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'poll.db')}")
+        configure_sqlite(engine, dict(sqlite_pragmas(), foreign_keys="OFF"))
+        Base.metadata.create_all(bind=engine)
+        print(f"Seeding {args.votes:,} votes...")
+        poll_id = seed(engine, args.votes)
+
+        with Session(engine) as db:
+            _poll_results(db, poll_id)  # warm the page cache
+            results, elapsed, peak = measure(lambda: _poll_results(db, poll_id))
+        print(f"grouped query: {elapsed * 1000:8.1f} ms, peak {peak / 1024:10.1f} KiB, {results.total_votes:,} votes")
+        for option in results.results:
+            print(f"    {option.text:<10}{option.votes:>10,}{option.percentage:>7.1f}%")
+
+        if args.legacy:
+            with Session(engine) as db:
+                _, legacy_elapsed, legacy_peak = measure(lambda: legacy_results(db, poll_id))
+            print(f"legacy Counter: {legacy_elapsed * 1000:7.1f} ms, peak {legacy_peak / 1024:10.1f} KiB")
+        engine.dispose()
+
+    assert results.total_votes == args.votes, "tally does not match the number of votes seeded"
+    if peak > args.max_memory_kb * 1024:
+        sys.exit(f"FAIL: peak memory {peak / 1024:.1f} KiB exceeds {args.max_memory_kb} KiB")
+    print(f"OK: peak memory within {args.max_memory_kb} KiB")
+
+
+if __name__ == "__main__":
+    main()
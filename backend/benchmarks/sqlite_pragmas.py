@@ -0,0 +1,133 @@
+"""
+Concurrent read/write throughput on SQLite with and without the pragma profile.
+
+For each profile, seeds a fresh database file, then runs reader threads
+(feed-style queries) against writer threads (small committed inserts, like
+votes and RSVPs) for a fixed time and reports operations per second. The
+"default" profile is SQLite's stock rollback journal with synchronous=FULL;
+"tuned" is the profile from sqlite_tuning.py as configured by the
+environment.
+
+Usage (from the project root):
+    python backend/benchmarks/sqlite_pragmas.py --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import create_engine, exc, text  # noqa: E402
+
+from backend.db import Base  # noqa: E402
+from backend import models  # noqa: E402,F401
+from backend.pool import engine_options  # noqa: E402
+from backend.sqlite_tuning import configure_sqlite, sqlite_pragmas  # noqa: E402
+
+FEED_QUERY = text(
+    "SELECT id, title, upvotes, downvotes FROM posts WHERE union_id = :union_id "
+    "ORDER BY created_at DESC, id DESC LIMIT 20"
+)
+WRITE_QUERY = text(
+    "INSERT INTO comments (content, post_id, user_id, created_at, updated_at) "
+    "VALUES (:content, :post_id, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+)
+
+
+def build_engine(path: str, pragmas: dict):
+    url = f"sqlite:///{path}"
+    options = engine_options(url)
+    options["pool_size"] = options["max_overflow"] = 32
+    engine = create_engine(url, **options)
+    configure_sqlite(engine, pragmas)
+    return engine
+
+
+def seed(engine, unions: int = 10, posts_per_union: int = 100) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, username, hashed_password, role) VALUES (1, 'bench', 'x', 'member')"))
+        for u in range(1, unions + 1):
+            connection.execute(text("INSERT INTO unions (id, name, created_at) VALUES (:id, :name, CURRENT_TIMESTAMP)"),
+                               {"id": u, "name": f"Bench {u}"})
+            connection.execute(
+                text("INSERT INTO posts (title, content, union_id, created_at) VALUES (:t, 'body', :u, CURRENT_TIMESTAMP)"),
+                [{"t": f"Post {p}", "u": u} for p in range(posts_per_union)],
+            )
+
+
+def run(engine, readers: int, writers: int, duration: float) -> dict:
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def reader(n):
+        done = errors = 0
+        while time.monotonic() < stop:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(FEED_QUERY, {"union_id": n % 10 + 1}).all()
+                done += 1
+            except exc.OperationalError:
+                errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    def writer(n):
+        done = errors = 0
+        while time.monotonic() < stop:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(WRITE_QUERY, {"content": f"w{n}-{done}", "post_id": done % 1000 + 1})
+                done += 1
+            except exc.OperationalError:
+                errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "reads_per_s": counts["reads"] / duration,
+        "writes_per_s": counts["writes"] / duration,
+        "errors": counts["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per profile")
+    args = parser.parse_args()
+
+    tuned = sqlite_pragmas() or {"journal_mode": "WAL", "synchronous": "NORMAL"}
+    profiles = {"default": {}, "tuned": tuned}
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, pragmas in profiles.items():
+            engine = build_engine(os.path.join(tmpdir, f"{name}.db"), pragmas)
+            seed(engine)
+            print(f"{name}: {args.readers} readers, {args.writers} writers for {args.duration:g}s...")
+            results[name] = run(engine, args.readers, args.writers, args.duration)
+            engine.dispose()
+
+    print()
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['reads_per_s']:>12.1f}{r['writes_per_s']:>12.1f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
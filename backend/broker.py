@@ -0,0 +1,167 @@
+"""
+In-process publish/subscribe for live update streams (Server-Sent Events).
+
+Stream endpoints subscribe to a channel such as ``poll:<id>`` and relay what
+is published on it. Write handlers publish after committing. They run in
+the threadpool, so publish() is thread-safe and hands messages to the event
+loop with call_soon_threadsafe. Publishing to a channel nobody watches costs
+a dict lookup.
+
+Messages published with a ``coalesce_key`` are snapshots where only the
+latest matters (e.g. poll tallies): within one coalescing window only the
+last one is delivered. A burst of votes then costs viewers one update per
+window rather than one per vote.
+
+Each subscription buffers at most STREAM_BUFFER_SIZE messages. A subscriber
+that falls that far behind (a stalled client on a busy channel) is dropped:
+its buffer is discarded and its next read raises SlowConsumer, so the stream
+ends and the client reconnects to a fresh snapshot instead of the server
+holding an ever-growing backlog for it.
+
+The broker is per process. With several workers, each one only sees the
+writes it handled itself, so run streams on a single worker (or put a shared
+bus in front) if that matters.
+
+Configuration (environment):
+    STREAM_COALESCE_SECONDS   coalescing window for snapshot messages (default 0.25)
+    STREAM_KEEPALIVE_SECONDS  idle seconds between SSE keep-alive comments (default 15)
+    STREAM_BUFFER_SIZE        messages buffered per subscriber before it is dropped (default 100)
+"""
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+STREAM_COALESCE_SECONDS = float(os.getenv("STREAM_COALESCE_SECONDS", "0.25"))
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "100"))
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+_CLOSED = object()
+
+
+class SlowConsumer(Exception):
+    """The subscriber fell more than its buffer size behind and was dropped."""
+
+
+class Subscription:
+    """One subscriber's view of a channel; read it with ``await get()``."""
+
+    def __init__(self, channel: str, maxsize: int = STREAM_BUFFER_SIZE):
+        self.channel = channel
+        self.maxsize = maxsize
+        # One extra slot so the close marker always fits
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize + 1)
+
+    async def get(self):
+        message = await self.queue.get()
+        if message is _CLOSED:
+            raise SlowConsumer(self.channel)
+        return message
+
+
+class Broker:
+    def __init__(self, coalesce_window: float = STREAM_COALESCE_SECONDS):
+        self.coalesce_window = coalesce_window
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def subscribe(self, channel: str, maxsize: int = STREAM_BUFFER_SIZE) -> Subscription:
+        """Start receiving ``channel``. Must be called on the event loop."""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(channel, maxsize)
+        self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._channels.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.channel]
+
+    def has_subscribers(self, channel: str) -> bool:
+        return bool(self._channels.get(channel))
+
+    def publish(self, channel: str, message, coalesce_key: Optional[str] = None) -> None:
+        """Deliver ``message`` to every subscriber of ``channel``. Safe from any thread."""
+        loop = self._loop
+        if loop is None or not self.has_subscribers(channel):
+            return
+        self.published += 1
+        try:
+            if coalesce_key is None:
+                loop.call_soon_threadsafe(self._fanout, channel, message)
+                return
+            with self._lock:
+                scheduled = (channel, coalesce_key) in self._pending
+                self._pending[(channel, coalesce_key)] = message
+            if scheduled:
+                self.coalesced += 1
+            else:
+                loop.call_soon_threadsafe(loop.call_later, self.coalesce_window, self._flush, channel, coalesce_key)
+        except RuntimeError:
+            # The loop that subscribed has shut down; nobody is listening any more
+            pass
+
+    def _flush(self, channel: str, coalesce_key: str) -> None:
+        with self._lock:
+            message = self._pending.pop((channel, coalesce_key), None)
+        if message is not None:
+            self._fanout(channel, message)
+
+    def _fanout(self, channel: str, message) -> None:
+        for subscription in list(self._channels.get(channel, ())):
+            if subscription.queue.qsize() >= subscription.maxsize:
+                self._drop(subscription)
+                continue
+            subscription.queue.put_nowait(message)
+            self.delivered += 1
+
+    def _drop(self, subscription: Subscription) -> None:
+        """Disconnect a subscriber whose buffer is full, freeing its backlog."""
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(_CLOSED)
+        self.dropped += 1
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(s) for s in self._channels.values()),
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+broker = Broker()
+
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event carrying ``data`` as JSON."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}\n\n"
+
+
+async def next_message(subscription: Subscription, keepalive: float = STREAM_KEEPALIVE_SECONDS):
+    """The next message on ``subscription``, or None after ``keepalive`` idle seconds.
+
+    Raises SlowConsumer if the subscriber was dropped for falling behind.
+    """
+    try:
+        return await asyncio.wait_for(subscription.get(), keepalive)
+    except asyncio.TimeoutError:
+        return None
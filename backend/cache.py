@@ -0,0 +1,273 @@
+"""
+Response cache for anonymous read endpoints.
+
+Cached responses are grouped into namespaces (``unions``, ``events``,
+``posts:<union_id>``). Write handlers call ``response_cache.invalidate()``
+with the namespaces they affect. Invalidation bumps the namespace's
+generation number rather than hunting down keys, so it is O(1) on every
+backend and stale entries simply age out of the LRU.
+
+Configuration (environment):
+    RESPONSE_CACHE_TTL      seconds an entry stays fresh (default 30, 0 disables)
+    RESPONSE_CACHE_MAXSIZE  entries kept by the in-process LRU (default 1024)
+    RESPONSE_CACHE_URL      redis://... to share the cache between workers
+                            (requires the ``redis`` package)
+"""
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from .db import primary_reads
+from .etag import NOT_MODIFIED, etag_matches
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """Per-process backend built on TTLCache."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def get(self, key: str):
+        return self._entries.get(key)
+
+    def set(self, key: str, value) -> None:
+        self._entries.set(key, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._generations.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Backend shared across workers through a Redis-compatible server."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "bunchup:cache:"):
+        import redis  # optional dependency, only needed when RESPONSE_CACHE_URL is set
+
+        self._client = redis.Redis.from_url(url)
+        self._ttl = max(1, int(ttl))
+        self._prefix = prefix
+
+    def generation(self, namespace: str) -> int:
+        value = self._client.get(f"{self._prefix}gen:{namespace}")
+        return int(value) if value else 0
+
+    def bump(self, namespace: str) -> None:
+        self._client.incr(f"{self._prefix}gen:{namespace}")
+
+    def get(self, key: str):
+        value = self._client.get(f"{self._prefix}entry:{key}")
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key: str, value) -> None:
+        self._client.set(f"{self._prefix}entry:{key}", pickle.dumps(value), ex=self._ttl)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self._prefix}*"):
+            self._client.delete(key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(f"{self._prefix}entry:*"))
+
+
+class ResponseCache:
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    def key(self, namespace: str, key: str) -> str:
+        """Storage key for ``key`` in the namespace's current generation.
+
+        Resolve it before running the handler so a write that lands while
+        the response is being built cannot be cached under the new generation.
+        """
+        return f"{namespace}:{self.backend.generation(namespace)}:{key}"
+
+    def get(self, storage_key: str):
+        value = self.backend.get(storage_key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, storage_key: str, value) -> None:
+        self.backend.set(storage_key, value)
+        self.stores += 1
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every cached response in ``namespaces``; call after committing a write."""
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = self.misses = self.stores = self.invalidations = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "size": self.backend.size(),
+        }
+
+
+def _build_response_cache() -> ResponseCache:
+    ttl = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    url = os.getenv("RESPONSE_CACHE_URL")
+    if url:
+        backend = RedisBackend(url, ttl=ttl)
+    else:
+        backend = MemoryBackend(maxsize=int(os.getenv("RESPONSE_CACHE_MAXSIZE", "1024")), ttl=ttl)
+    return ResponseCache(backend, enabled=ttl > 0)
+
+
+response_cache = _build_response_cache()
+
+# GET paths served from the cache, with the namespace each one belongs to.
+# Named groups are substituted into the namespace.
+CACHED_ROUTES: List[Tuple[str, str]] = [
+    (r"^/api/unions/?$", "unions"),
+    (r"^/api/unions/industries$", "unions"),
+    (r"^/api/events/?$", "events"),
+    (r"^/api/posts/union/(?P<union_id>\d+)$", "posts:{union_id}"),
+]
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cacheable anonymous GETs from ``response_cache``.
+
+    Requests carrying an Authorization header always reach the handler, since
+    responses such as list_unions' is_member depend on the caller. Misses are
+    answered from the primary database, never a read replica, so a refill
+    right after an invalidation cannot cache pre-write data.
+    """
+
+    def __init__(self, app, cache: ResponseCache = response_cache, routes: Iterable[Tuple[str, str]] = CACHED_ROUTES):
+        self.app = app
+        self.cache = cache
+        self.routes = [(re.compile(pattern), namespace) for pattern, namespace in routes]
+
+    def _namespace(self, path: str) -> Optional[str]:
+        for pattern, namespace in self.routes:
+            match = pattern.match(path)
+            if match:
+                return namespace.format(**match.groupdict())
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not self.cache.enabled:
+            await self.app(scope, receive, send)
+            return
+        if any(name == b"authorization" for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        namespace = self._namespace(scope["path"])
+        if namespace is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        key = self.cache.key(namespace, f"{scope['path']}?{query}")
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            status, headers, body = cached
+            etag = next((value for name, value in headers if name == b"etag"), None)
+            if_none_match = next((value for name, value in scope["headers"] if name == b"if-none-match"), None)
+            if etag and if_none_match and etag_matches(if_none_match.decode("latin-1"), etag.decode("latin-1")):
+                await send({"type": "http.response.start", "status": NOT_MODIFIED, "headers": [(b"etag", etag), (b"x-cache", b"HIT")]})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({"type": "http.response.start", "status": status, "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start = {}
+        chunks = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"x-cache", b"MISS")])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False) and start.get("status") == 200:
+                    self.cache.set(key, (200, list(start.get("headers", [])), b"".join(chunks)))
+            await send(message)
+
+        with primary_reads():
+            await self.app(scope, receive, capture)
@@ -1,8 +1,13 @@
 import os
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from .pool import engine_options
+from .sqlite_tuning import configure_sqlite
+
 # Database URL for local development or production. If DATABASE_URL is set in
 # the environment (e.g. postgres), use that. Otherwise, fall back to an
 # absolute SQLite file located in the backend package for easy local dev.
@@ -14,14 +19,104 @@ if DATABASE_URL:
 else:
     SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-# For SQLite we need the check_same_thread connect arg; other DBs don't need it.
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Pool sizing, recycling and pre-ping come from the environment with
+# per-backend defaults (see pool.py); SQLite also gets check_same_thread=False.
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+# WAL, synchronous=NORMAL and friends on SQLite (see sqlite_tuning.py)
+configure_sqlite(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica. Read-only handlers take their session from
+# get_read_db, which uses DATABASE_READ_URL when set and the primary
+# otherwise. Writes, and reads that must see the caller's own writes, stay
+# on get_db.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+SQLALCHEMY_READ_DATABASE_URL = DATABASE_READ_URL or SQLALCHEMY_DATABASE_URL
+if DATABASE_READ_URL:
+    read_engine = create_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL))
+    configure_sqlite(read_engine)
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _refuse_writes(session, flush_context, instances):
+    """Fail loudly if a handler on a read session tries to write."""
+    if session.new or session.deleted or any(session.is_modified(obj) for obj in session.dirty):
+        raise RuntimeError("Attempted to write through a read-only session; use get_db")
+
+
+# Responses stored in the shared response cache must not be built from a
+# lagging replica: right after a write invalidates a namespace, the refill
+# would otherwise pin the pre-write body for the whole cache TTL. The cache
+# middleware wraps fills in primary_reads(), which points get_read_db (and
+# get_async_db) at the primary. Fills only happen on misses, so the primary
+# serves about one read per cached entry per TTL.
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Serve read sessions opened inside this block from the primary."""
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+# DB_MODE=async serves the read endpoints of the posts, unions, events and
+# polls routers from async handlers on an asyncio engine (aiosqlite for
+# SQLite, asyncpg for Postgres) instead of the threadpool. Writes keep using
+# the sync engine above in both modes, so the async engine only ever reads
+# and connects to the read replica when one is configured.
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+
+async_engine = None
+_async_sessionmaker = None
+_async_primary_sessionmaker = None
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver."""
+    scheme, sep, rest = url.partition("://")
+    base = scheme.split("+")[0]
+    if base == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if base in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+def _create_async_sessionmaker(url: str):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = async_database_url(url)
+    engine = create_async_engine(url, **engine_options(url, asyncio=True))
+    configure_sqlite(engine.sync_engine)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def get_async_sessionmaker(primary: bool = False):
+    """Create the async engine on first use so sync deployments need no async drivers.
+
+    ``primary=True`` gives a sessionmaker on the primary even when a read
+    replica is configured (see primary_reads).
+    """
+    global async_engine, _async_sessionmaker, _async_primary_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = _create_async_sessionmaker(SQLALCHEMY_READ_DATABASE_URL)
+        async_engine = _async_sessionmaker.kw["bind"]
+    if not primary or not DATABASE_READ_URL:
+        return _async_sessionmaker
+    if _async_primary_sessionmaker is None:
+        _async_primary_sessionmaker = _create_async_sessionmaker(SQLALCHEMY_DATABASE_URL)
+    return _async_primary_sessionmaker
+
+
 Base = declarative_base()
 
 
@@ -36,3 +131,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Like get_db, but on the read replica (or the primary when none is configured).
+
+    Only for handlers that never write and can tolerate replication lag.
+    Inside primary_reads() the session is on the primary instead.
+    """
+    db = SessionLocal() if _primary_reads.get() else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Async counterpart of get_db, yielding an AsyncSession."""
+    async with get_async_sessionmaker(primary=_primary_reads.get())() as db:
+        yield db
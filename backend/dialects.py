@@ -0,0 +1,26 @@
+"""
+Dialect-specific statement helpers.
+
+SQLite and Postgres both support ``INSERT ... ON CONFLICT``, but SQLAlchemy
+only exposes it through each dialect's own ``insert()`` construct. Handlers
+that need a conflict-aware insert get the right one for their session here.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def dialect_name(db) -> str:
+    return db.get_bind().dialect.name
+
+
+def conflict_insert(db, table):
+    """``insert(table)`` supporting on_conflict_do_update/do_nothing on ``db``'s backend."""
+    name = dialect_name(db)
+    try:
+        return _INSERTS[name](table)
+    except KeyError:
+        raise NotImplementedError(f"INSERT ... ON CONFLICT is not supported on {name}")
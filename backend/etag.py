@@ -0,0 +1,41 @@
+"""
+Strong ETags and conditional GETs for frequently polled endpoints.
+
+Each endpoint computes a cheap version marker (row counts, max ids and
+timestamps from one aggregate query), hashes it with the request's query
+string into an ETag, and answers ``If-None-Match`` with 304 before loading
+or serializing the payload.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+NOT_MODIFIED = 304
+
+
+def make_etag(request: Request, *marker) -> str:
+    """Strong ETag over a version marker and the request's query parameters."""
+    digest = hashlib.sha1(repr((request.url.path, sorted(request.query_params.multi_items()), marker)).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def check_etag(request: Request, response: Response, *marker) -> Optional[Response]:
+    """Tag ``response`` with an ETag for ``marker``.
+
+    Returns a ready 304 response if the client already has this version,
+    otherwise None and the handler carries on building the payload.
+    """
+    etag = make_etag(request, *marker)
+    response.headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=NOT_MODIFIED, headers={"ETag": etag})
+    return None
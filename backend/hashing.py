@@ -0,0 +1,80 @@
+"""
+Password hashing off the request thread pool.
+
+bcrypt is deliberately slow, and route handlers run in Starlette's shared
+thread pool, so a burst of logins could occupy every thread and stall
+unrelated reads. Hashes are computed in a dedicated process pool instead,
+and at most ``PASSWORD_HASH_QUEUE_DEPTH`` requests may be running or
+waiting on it. Past that, run() raises HashingBusy immediately rather than
+holding a request thread, and the caller answers 503.
+
+This module only imports bcrypt so that pool workers start quickly.
+
+Configuration (environment):
+    BCRYPT_ROUNDS              cost factor for new hashes (default 12)
+    PASSWORD_HASH_WORKERS      worker processes (default min(4, cpus); 0 hashes inline)
+    PASSWORD_HASH_QUEUE_DEPTH  running + queued hashes before refusing (default 4 x workers)
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", str(max(1, PASSWORD_HASH_WORKERS) * 4)))
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def hash_password_bytes(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def check_password_bytes(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_QUEUE_DEPTH)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the server process is multi-threaded
+            _pool = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def run(fn, *args):
+    """Run ``fn(*args)`` on the hashing pool and wait for the result.
+
+    Raises HashingBusy without waiting if the queue is already full.
+    """
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        if PASSWORD_HASH_WORKERS <= 0:
+            return fn(*args)
+        return _get_pool().submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
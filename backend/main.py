@@ -7,7 +7,10 @@ import os
 load_dotenv()
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import api_router
+from .cache import ResponseCacheMiddleware
 from .db import engine, Base, get_db
+from . import hashing
+from .search import ensure_search_index
 
 # Make sure models are imported so SQLAlchemy can create tables
 from . import models  # noqa: F401
@@ -16,6 +19,10 @@ Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="Bunch Up API", description="API backend for Bunch Up labor organization platform")
 
+# Serve repeat anonymous reads from the response cache (see cache.py). Added
+# before CORS so CORS headers are computed per request, not cached.
+app.add_middleware(ResponseCacheMiddleware)
+
 # Basic CORS setup for local dev; adjust origins for production security.
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 app.include_router(api_router, prefix="/api")
 
@@ -30,6 +38,11 @@ app.include_router(api_router, prefix="/api")
 @app.on_event("startup")
 def startup_event():
     """Create default data on startup if it doesn't exist"""
+    # Databases upgraded from before full-text search start with an empty index
+    with engine.begin() as connection:
+        if ensure_search_index(connection):
+            print("✓ Rebuilt search index")
+
     db = next(get_db())
     try:
         # Create default union if none exists
@@ -46,6 +59,12 @@ def startup_event():
         db.close()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop the password hashing worker processes"""
+    hashing.shutdown()
+
+
 @app.get("/")
 def read_root():
     return {"message": "Bunch Up backend is running"}
@@ -0,0 +1,33 @@
+"""
+Migration script to add the composite indexes used by cursor pagination.
+
+create_all() only creates indexes together with their tables, so databases
+created before the (created_at, id) / (start_time, id) indexes were declared
+need this script run once. It creates every declared composite index, so it
+also adds later ones such as ix_votes_poll_option (poll results) and
+ix_event_attendees_event_created_at_id (attendee listing).
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.db import engine, Base
+from backend import models  # noqa: F401
+
+
+def migrate():
+    print("Starting pagination index migration...")
+
+    Base.metadata.create_all(bind=engine)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if len(index.columns) > 1:
+                index.create(bind=engine, checkfirst=True)
+                print(f"✓ {index.name}")
+
+    print("\n✅ Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
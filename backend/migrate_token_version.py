@@ -0,0 +1,35 @@
+"""
+Migration script to add users.token_version.
+
+Access tokens embed the user's token_version as the "ver" claim and are
+rejected once it no longer matches, which is how role changes retire old
+tokens. Databases created before the column existed need this script run
+once; tokens issued before it carry no "ver" and match version 0.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.db import engine, Base
+from backend import models  # noqa: F401
+from sqlalchemy import text, inspect
+
+
+def migrate():
+    print("Starting token version migration...")
+
+    Base.metadata.create_all(bind=engine)
+
+    users_columns = [col['name'] for col in inspect(engine).get_columns('users')]
+    with engine.begin() as conn:
+        if "token_version" not in users_columns:
+            conn.execute(text("ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"))
+            print("✓ Added token_version column")
+        else:
+            print("✓ token_version column already exists")
+
+    print("\n✅ Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
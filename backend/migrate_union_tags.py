@@ -0,0 +1,43 @@
+"""
+Migration script to populate the union_tags table from unions.tags.
+
+New and updated unions keep union_tags in sync automatically; this splits the
+comma-separated tag strings of unions created before the table existed.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.db import engine, Base, get_db
+from backend import models
+
+
+def migrate():
+    print("Starting union tags migration...")
+
+    # Create all tables (this creates union_tags if it does not exist yet)
+    Base.metadata.create_all(bind=engine)
+    print("✓ Created new tables")
+
+    db = next(get_db())
+    try:
+        unions = db.query(models.Union).all()
+        for union in unions:
+            # Reassigning the string rebuilds the union's tag rows
+            union.tags = union.tags
+        db.commit()
+        tag_count = db.query(models.UnionTag).count()
+        print(f"✓ Indexed {tag_count} tags across {len(unions)} unions")
+
+        print("\n✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
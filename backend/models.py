@@ -7,9 +7,13 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     UniqueConstraint,
+    Index,
+    DDL,
+    event,
 )
 from sqlalchemy.orm import relationship
 from .db import Base
+from typing import List, Optional
 import datetime
 
 
@@ -25,6 +29,41 @@ class Union(Base):
 
     posts = relationship("Post", back_populates="union", cascade="all, delete-orphan")
     members = relationship("UnionMember", back_populates="union", cascade="all, delete-orphan")
+    tag_links = relationship("UnionTag", back_populates="union", cascade="all, delete-orphan")
+
+    __table_args__ = (Index("ix_unions_created_at_id", "created_at", "id"),)
+
+
+def normalize_tags(tags: Optional[str]) -> List[str]:
+    """Split a comma-separated tag string into unique, lowercased tags."""
+    seen = []
+    for tag in (tags or "").split(","):
+        tag = tag.strip().lower()
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+class UnionTag(Base):
+    __tablename__ = "union_tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    union_id = Column(Integer, ForeignKey("unions.id"), nullable=False)
+    tag = Column(String, nullable=False)
+
+    union = relationship("Union", back_populates="tag_links")
+
+    __table_args__ = (
+        UniqueConstraint("union_id", "tag", name="unique_union_tag"),
+        Index("ix_union_tags_tag_union", "tag", "union_id"),
+    )
+
+
+@event.listens_for(Union.tags, "set")
+def _sync_union_tags(target, value, oldvalue, initiator):
+    """Mirror Union.tags into union_tags rows whenever the string is assigned."""
+    existing = {link.tag: link for link in target.tag_links}
+    target.tag_links = [existing.get(tag) or UnionTag(tag=tag) for tag in normalize_tags(value)]
 
 
 class Post(Base):
@@ -35,12 +74,17 @@ class Post(Base):
     content = Column(Text)
     union_id = Column(Integer, ForeignKey("unions.id"))
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Denormalized tallies of post_votes, maintained by database triggers
+    upvotes = Column(Integer, nullable=False, default=0, server_default="0")
+    downvotes = Column(Integer, nullable=False, default=0, server_default="0")
 
     union = relationship("Union", back_populates="posts")
     feedbacks = relationship("Feedback", back_populates="post", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     votes = relationship("PostVote", back_populates="post", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_posts_union_created_at_id", "union_id", "created_at", "id"),)
+
 
 class Feedback(Base):
     __tablename__ = "feedbacks"
@@ -53,6 +97,8 @@ class Feedback(Base):
 
     post = relationship("Post", back_populates="feedbacks")
 
+    __table_args__ = (Index("ix_feedbacks_post_created_at_id", "post_id", "created_at", "id"),)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -62,6 +108,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(String, default="member", index=True)  # member | organizer | admin
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Embedded in access tokens as "ver"; bumping it invalidates every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
     union_memberships = relationship("UnionMember", back_populates="user", cascade="all, delete-orphan")
@@ -79,7 +127,10 @@ class UnionMember(Base):
     union = relationship("Union", back_populates="members")
     user = relationship("User", back_populates="union_memberships")
 
-    __table_args__ = (UniqueConstraint("union_id", "user_id", name="unique_union_member"),)
+    __table_args__ = (
+        UniqueConstraint("union_id", "user_id", name="unique_union_member"),
+        Index("ix_union_members_union_joined_at_id", "union_id", "joined_at", "id"),
+    )
 
 
 
@@ -95,10 +146,14 @@ class Event(Base):
     union_id = Column(Integer, ForeignKey("unions.id"), nullable=True)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Denormalized count of event_attendees, maintained by database triggers
+    attendee_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     creator = relationship("User", foreign_keys=[creator_id])
     attendees = relationship("EventAttendee", back_populates="event", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_events_start_time_id", "start_time", "id"),)
+
 
 class EventAttendee(Base):
     __tablename__ = "event_attendees"
@@ -111,7 +166,10 @@ class EventAttendee(Base):
     event = relationship("Event", back_populates="attendees")
     user = relationship("User")
 
-    __table_args__ = (UniqueConstraint("event_id", "user_id", name="unique_event_attendee"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="unique_event_attendee"),
+        Index("ix_event_attendees_event_created_at_id", "event_id", "created_at", "id"),
+    )
 
 
 
@@ -125,6 +183,8 @@ class Poll(Base):
 
     options = relationship("PollOption", back_populates="poll", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_polls_created_at_id", "created_at", "id"),)
+
 
 class PollOption(Base):
     __tablename__ = "poll_options"
@@ -139,7 +199,11 @@ class PollOption(Base):
 
 class Vote(Base):
     __tablename__ = "votes"
-    __table_args__ = (UniqueConstraint("poll_id", "user_id", name="uq_poll_user"),)
+    __table_args__ = (
+        UniqueConstraint("poll_id", "user_id", name="uq_poll_user"),
+        # Covers the per-option GROUP BY behind poll results
+        Index("ix_votes_poll_option", "poll_id", "option_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     poll_id = Column(Integer, ForeignKey("polls.id"), index=True)
@@ -163,6 +227,8 @@ class Comment(Base):
     post = relationship("Post", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
+    __table_args__ = (Index("ix_comments_post_created_at_id", "post_id", "created_at", "id"),)
+
 
 class PostVote(Base):
     __tablename__ = "post_votes"
@@ -176,3 +242,130 @@ class PostVote(Base):
 
     post = relationship("Post", back_populates="votes")
     user = relationship("User", back_populates="post_votes")
+
+
+# Keep posts.upvotes/downvotes in step with post_votes. Triggers run in the
+# same transaction as the vote write, so the counters can never drift, and
+# they also cover bulk and Core-level statements that bypass the ORM.
+POST_VOTE_COUNTER_TRIGGERS = {
+    "sqlite": [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_post_votes_insert AFTER INSERT ON post_votes
+        BEGIN
+            UPDATE posts SET
+                upvotes = upvotes + (CASE WHEN NEW.vote_type = 'up' THEN 1 ELSE 0 END),
+                downvotes = downvotes + (CASE WHEN NEW.vote_type = 'down' THEN 1 ELSE 0 END)
+            WHERE id = NEW.post_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_post_votes_update AFTER UPDATE OF vote_type, post_id ON post_votes
+        BEGIN
+            UPDATE posts SET
+                upvotes = upvotes - (CASE WHEN OLD.vote_type = 'up' THEN 1 ELSE 0 END),
+                downvotes = downvotes - (CASE WHEN OLD.vote_type = 'down' THEN 1 ELSE 0 END)
+            WHERE id = OLD.post_id;
+            UPDATE posts SET
+                upvotes = upvotes + (CASE WHEN NEW.vote_type = 'up' THEN 1 ELSE 0 END),
+                downvotes = downvotes + (CASE WHEN NEW.vote_type = 'down' THEN 1 ELSE 0 END)
+            WHERE id = NEW.post_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_post_votes_delete AFTER DELETE ON post_votes
+        BEGIN
+            UPDATE posts SET
+                upvotes = upvotes - (CASE WHEN OLD.vote_type = 'up' THEN 1 ELSE 0 END),
+                downvotes = downvotes - (CASE WHEN OLD.vote_type = 'down' THEN 1 ELSE 0 END)
+            WHERE id = OLD.post_id;
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION post_votes_maintain_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE posts SET
+                    upvotes = upvotes - (CASE WHEN OLD.vote_type = 'up' THEN 1 ELSE 0 END),
+                    downvotes = downvotes - (CASE WHEN OLD.vote_type = 'down' THEN 1 ELSE 0 END)
+                WHERE id = OLD.post_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE posts SET
+                    upvotes = upvotes + (CASE WHEN NEW.vote_type = 'up' THEN 1 ELSE 0 END),
+                    downvotes = downvotes + (CASE WHEN NEW.vote_type = 'down' THEN 1 ELSE 0 END)
+                WHERE id = NEW.post_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_post_votes_counters ON post_votes",
+        """
+        CREATE TRIGGER trg_post_votes_counters
+        AFTER INSERT OR DELETE OR UPDATE OF vote_type, post_id ON post_votes
+        FOR EACH ROW EXECUTE FUNCTION post_votes_maintain_counters()
+        """,
+    ],
+}
+
+for _dialect, _statements in POST_VOTE_COUNTER_TRIGGERS.items():
+    for _statement in _statements:
+        event.listen(PostVote.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# Keep events.attendee_count in step with event_attendees, the same way as
+# the post vote counters above.
+EVENT_ATTENDEE_COUNTER_TRIGGERS = {
+    "sqlite": [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_event_attendees_insert AFTER INSERT ON event_attendees
+        BEGIN
+            UPDATE events SET attendee_count = attendee_count + 1 WHERE id = NEW.event_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_event_attendees_update AFTER UPDATE OF event_id ON event_attendees
+        BEGIN
+            UPDATE events SET attendee_count = attendee_count - 1 WHERE id = OLD.event_id;
+            UPDATE events SET attendee_count = attendee_count + 1 WHERE id = NEW.event_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_event_attendees_delete AFTER DELETE ON event_attendees
+        BEGIN
+            UPDATE events SET attendee_count = attendee_count - 1 WHERE id = OLD.event_id;
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION event_attendees_maintain_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE events SET attendee_count = attendee_count - 1 WHERE id = OLD.event_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE events SET attendee_count = attendee_count + 1 WHERE id = NEW.event_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_event_attendees_count ON event_attendees",
+        """
+        CREATE TRIGGER trg_event_attendees_count
+        AFTER INSERT OR DELETE OR UPDATE OF event_id ON event_attendees
+        FOR EACH ROW EXECUTE FUNCTION event_attendees_maintain_count()
+        """,
+    ],
+}
+
+for _dialect, _statements in EVENT_ATTENDEE_COUNTER_TRIGGERS.items():
+    for _statement in _statements:
+        event.listen(EventAttendee.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# Registers the full-text search table DDL and its sync hooks on these models
+from . import search  # noqa: E402,F401
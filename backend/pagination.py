@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination helpers shared by the list endpoints.
+
+Offset pagination makes the database walk and discard every skipped row, so
+deep pages get slower the further a user scrolls. Keyset pagination instead
+remembers the sort key of the last row returned, (created_at, id) or
+(start_time, id), and asks for rows strictly after it. Backed by a matching
+composite index, page N costs the same as page 1.
+
+The key is handed to clients as an opaque cursor in the ``X-Next-Cursor``
+response header, so list bodies keep their existing shape.
+"""
+import base64
+import binascii
+import datetime
+import json
+from typing import Callable, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime.datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) sort key as an opaque, URL-safe cursor."""
+    payload = json.dumps([sort_value.isoformat(), row_id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, sort_column, id_column, cursor: Optional[str], skip: int, limit: int, descending: bool = False):
+    """Order ``query`` by (sort_column, id_column) and restrict it to one page.
+
+    With a cursor, only rows after the cursor's key are returned and ``skip``
+    is ignored; without one, the legacy offset is applied so existing clients
+    keep working.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id),
+            ))
+    elif skip:
+        query = query.offset(skip)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    return query.limit(limit)
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int, key: Callable) -> None:
+    """Expose the cursor for the page after ``rows`` if the page was full."""
+    if rows and len(rows) >= limit:
+        sort_value, row_id = key(rows[-1])
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_value, row_id)
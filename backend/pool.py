@@ -0,0 +1,144 @@
+"""
+Connection pool configuration and metrics.
+
+Engines get a QueuePool sized from the environment, with defaults chosen
+per backend. Postgres connections are pre-pinged and recycled so
+connections dropped by the server or a proxy are replaced transparently.
+SQLite files keep the stock pool size and skip the ping, since there is no
+server to lose the connection. In-memory SQLite keeps SQLAlchemy's
+single-connection pool.
+
+The pool also counts checkouts, time spent blocked waiting for a free
+connection and checkout timeouts. These are served on /api/metrics so pool
+exhaustion shows up before it turns into 500s.
+
+Configuration (environment):
+    DB_POOL_SIZE          connections kept open (default 10 on Postgres, 5 on SQLite)
+    DB_MAX_OVERFLOW       extra connections opened under bursts (default 20 / 10)
+    DB_POOL_TIMEOUT       seconds to wait for a connection before failing (default 30)
+    DB_POOL_RECYCLE       seconds after which a connection is replaced (default 1800 / off)
+    DB_POOL_PRE_PING      test connections on checkout (default on for Postgres)
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+_TRUE = {"1", "true", "yes", "on"}
+
+# backend -> (pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping)
+POOL_DEFAULTS = {
+    "sqlite": (5, 10, 30.0, -1, False),
+    "default": (10, 20, 30.0, 1800, True),
+}
+
+
+class PoolMetrics:
+    """Thread-safe counters for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: bool, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if not timed_out:
+                self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+
+class _InstrumentedPoolMixin:
+    """Times QueuePool checkouts that have to block for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        # QueuePool blocks only once the pool and its overflow are both in use
+        waited = self._max_overflow > -1 and self._overflow >= self._max_overflow and self.checkedin() == 0
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(True, time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(waited, time.perf_counter() - start)
+        return record
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting across it
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _env(name: str, default):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    if isinstance(default, bool):
+        return value.lower() in _TRUE
+    return type(default)(value)
+
+
+def engine_options(url: str, asyncio: bool = False) -> dict:
+    """Keyword arguments for create_engine()/create_async_engine() on ``url``."""
+    backend = url.split(":", 1)[0].split("+")[0]
+    options = {}
+    if backend == "sqlite":
+        if not asyncio:
+            options["connect_args"] = {"check_same_thread": False}
+        if url.split("://", 1)[-1].lstrip("/") in ("", ":memory:"):
+            return options
+    size, overflow, timeout, recycle, pre_ping = POOL_DEFAULTS.get(backend, POOL_DEFAULTS["default"])
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if asyncio else InstrumentedQueuePool,
+        pool_size=_env("DB_POOL_SIZE", size),
+        max_overflow=_env("DB_MAX_OVERFLOW", overflow),
+        pool_timeout=_env("DB_POOL_TIMEOUT", timeout),
+        pool_recycle=_env("DB_POOL_RECYCLE", recycle),
+        pool_pre_ping=_env("DB_POOL_PRE_PING", pre_ping),
+    )
+    return options
+
+
+def pool_stats(pool) -> dict:
+    """Current occupancy and cumulative counters for ``pool``."""
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            waits=metrics.waits,
+            wait_ms_total=round(metrics.wait_seconds * 1000, 3),
+            wait_ms_max=round(metrics.max_wait_seconds * 1000, 3),
+            timeouts=metrics.timeouts,
+        )
+    return stats
@@ -0,0 +1,34 @@
+"""
+Rebuild the full-text search index from the unions, posts and comments tables.
+
+Writes made through the ORM keep the index in sync automatically. Run this
+once on databases created before search existed, and after any bulk import
+or delete that bypasses the ORM.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.db import engine, Base
+from backend import models  # noqa: F401
+from backend.search import rebuild_search_index, search_enabled
+
+
+def migrate():
+    print("Rebuilding search index...")
+
+    if not search_enabled(engine.dialect.name):
+        print(f"⚠ Full-text search is not available for {engine.dialect.name}; nothing to do")
+        return
+
+    # Creates the search_index table if it does not exist yet
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+
+    print("\n✅ Search index rebuilt successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,54 @@
+"""
+Reconcile the denormalized attendee counts on events with event_attendees.
+
+events.attendee_count is maintained by database triggers on every RSVP
+write. This script adds the column and triggers to databases created before
+they existed, then recomputes every event's count in bulk. It is safe to run
+repeatedly, e.g. after restoring a backup or importing RSVPs by hand.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.db import engine, Base
+from backend import models
+from sqlalchemy import text, inspect
+
+
+def reconcile(conn) -> int:
+    """Recompute events.attendee_count from event_attendees. Returns rows updated."""
+    result = conn.execute(text("""
+        UPDATE events SET attendee_count = (
+            SELECT COUNT(*) FROM event_attendees WHERE event_attendees.event_id = events.id
+        )
+    """))
+    return result.rowcount
+
+
+def migrate():
+    print("Starting attendee count reconciliation...")
+
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    events_columns = [col['name'] for col in inspector.get_columns('events')]
+
+    with engine.begin() as conn:
+        if "attendee_count" not in events_columns:
+            conn.execute(text("ALTER TABLE events ADD COLUMN attendee_count INTEGER NOT NULL DEFAULT 0"))
+            print("✓ Added attendee_count column")
+        else:
+            print("✓ attendee_count column already exists")
+
+        for statement in models.EVENT_ATTENDEE_COUNTER_TRIGGERS.get(engine.dialect.name, []):
+            conn.execute(text(statement))
+        print("✓ Installed attendee count triggers")
+
+        updated = reconcile(conn)
+        print(f"✓ Recomputed attendee counts for {updated} events")
+
+    print("\n✅ Reconciliation completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,61 @@
+"""
+Reconcile the denormalized vote counters on posts with the post_votes table.
+
+The upvotes/downvotes columns are maintained by database triggers on every
+vote write. This script adds the columns and triggers to databases created
+before they existed, then recomputes every post's tallies in bulk. It is safe
+to run repeatedly, e.g. after restoring a backup or importing votes by hand.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from backend.db import engine, Base
+from backend import models
+from sqlalchemy import text, inspect
+
+
+def reconcile(conn) -> int:
+    """Recompute posts.upvotes/downvotes from post_votes. Returns rows updated."""
+    result = conn.execute(text("""
+        UPDATE posts SET
+            upvotes = (
+                SELECT COUNT(*) FROM post_votes
+                WHERE post_votes.post_id = posts.id AND post_votes.vote_type = 'up'
+            ),
+            downvotes = (
+                SELECT COUNT(*) FROM post_votes
+                WHERE post_votes.post_id = posts.id AND post_votes.vote_type = 'down'
+            )
+    """))
+    return result.rowcount
+
+
+def migrate():
+    print("Starting vote counter reconciliation...")
+
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    posts_columns = [col['name'] for col in inspector.get_columns('posts')]
+
+    with engine.begin() as conn:
+        for column in ("upvotes", "downvotes"):
+            if column not in posts_columns:
+                conn.execute(text(f"ALTER TABLE posts ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+                print(f"✓ Added {column} column")
+            else:
+                print(f"✓ {column} column already exists")
+
+        for statement in models.POST_VOTE_COUNTER_TRIGGERS.get(engine.dialect.name, []):
+            conn.execute(text(statement))
+        print("✓ Installed vote counter triggers")
+
+        updated = reconcile(conn)
+        print(f"✓ Recomputed vote counts for {updated} posts")
+
+    print("\n✅ Reconciliation completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -7,13 +7,40 @@ from .auth import router as auth_router
 from .events import router as events_router
 from .polls import router as polls_router
 from .chatbot import router as chatbot_router
+from .search import router as search_router
+from .metrics import router as metrics_router
 
-api_router = APIRouter()
+from ..db import DB_MODE
 
-api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
-api_router.include_router(unions_router, prefix="/unions", tags=["unions"])
-api_router.include_router(posts_router, prefix="/posts", tags=["posts"])
-api_router.include_router(feedback_router, prefix="/feedbacks", tags=["feedbacks"])
-api_router.include_router(events_router, prefix="/events", tags=["events"])
-api_router.include_router(polls_router, prefix="/polls", tags=["polls"])
-api_router.include_router(chatbot_router, prefix="/chatbot", tags=["chatbot"])
+
+def build_api_router(mode: str = "sync") -> APIRouter:
+    """Assemble the API. In "async" mode the async read handlers are mounted
+    first so they answer the GETs they cover; everything else is served by
+    the sync routers as usual."""
+    api_router = APIRouter()
+
+    if mode == "async":
+        from .posts_async import router as posts_async_router
+        from .unions_async import router as unions_async_router
+        from .events_async import router as events_async_router
+        from .polls_async import router as polls_async_router
+
+        api_router.include_router(unions_async_router, prefix="/unions", tags=["unions"])
+        api_router.include_router(posts_async_router, prefix="/posts", tags=["posts"])
+        api_router.include_router(events_async_router, prefix="/events", tags=["events"])
+        api_router.include_router(polls_async_router, prefix="/polls", tags=["polls"])
+
+    api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
+    api_router.include_router(unions_router, prefix="/unions", tags=["unions"])
+    api_router.include_router(posts_router, prefix="/posts", tags=["posts"])
+    api_router.include_router(feedback_router, prefix="/feedbacks", tags=["feedbacks"])
+    api_router.include_router(events_router, prefix="/events", tags=["events"])
+    api_router.include_router(polls_router, prefix="/polls", tags=["polls"])
+    api_router.include_router(chatbot_router, prefix="/chatbot", tags=["chatbot"])
+    api_router.include_router(search_router, prefix="/search", tags=["search"])
+    api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+
+    return api_router
+
+
+api_router = build_api_router(DB_MODE)
@@ -11,6 +11,7 @@ from ..security import (
     get_password_hash,
     verify_password,
     get_current_user,
+    cache_user,
 )
 
 router = APIRouter()
@@ -52,7 +53,12 @@ def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=60 * 24)
-    access_token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
+    access_token = create_access_token(
+        data={"sub": user.username, "uid": user.id, "role": user.role, "ver": user.token_version},
+        expires_delta=access_token_expires,
+    )
+    # The first authenticated request can check its claims without a users query
+    cache_user(user)
     return schemas.Token(access_token=access_token)
 
 
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import delete, func, literal, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from .. import models, schemas
-from ..db import get_db
-from ..security import require_roles, get_current_user
+from ..cache import response_cache
+from ..db import get_db, get_read_db
+from ..dialects import conflict_insert
+from ..etag import check_etag
+from ..pagination import paginate, set_next_cursor
+from ..security import Principal, require_roles, get_current_principal
 
 router = APIRouter()
 
@@ -14,10 +19,12 @@ router = APIRouter()
 def create_event(
     event_in: schemas.EventCreate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     if event_in.end_time and event_in.end_time < event_in.start_time:
         raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    if event_in.union_id is not None and not db.query(models.Union.id).filter(models.Union.id == event_in.union_id).first():
+        raise HTTPException(status_code=404, detail="Union not found")
     evt = models.Event(
         title=event_in.title,
         description=event_in.description,
@@ -30,27 +37,30 @@ def create_event(
     db.add(evt)
     db.commit()
     db.refresh(evt)
-    
-    # Add attendee count
-    evt.attendee_count = len(evt.attendees)
+    response_cache.invalidate("events")
     return evt
 
 
 @router.get("/", response_model=List[schemas.Event])
-def list_events(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    events = db.query(models.Event).order_by(models.Event.start_time.desc()).offset(skip).limit(limit).all()
-    # Add attendee count to each event
-    for event in events:
-        event.attendee_count = len(event.attendees)
+def list_events(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    events = paginate(
+        db.query(models.Event), models.Event.start_time, models.Event.id, cursor, skip, limit, descending=True
+    ).all()
+    set_next_cursor(response, events, limit, key=lambda e: (e.start_time, e.id))
     return events
 
 
 @router.get("/{event_id}", response_model=schemas.Event)
-def get_event(event_id: int, db: Session = Depends(get_db)):
+def get_event(event_id: int, db: Session = Depends(get_read_db)):
     event = db.query(models.Event).filter(models.Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    event.attendee_count = len(event.attendees)
     return event
 
 
@@ -59,7 +69,7 @@ def update_event(
     event_id: int, 
     event_in: schemas.EventCreate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     event = db.query(models.Event).filter(models.Event.id == event_id).first()
     if not event:
@@ -71,6 +81,8 @@ def update_event(
     
     if event_in.end_time and event_in.end_time < event_in.start_time:
         raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    if event_in.union_id is not None and not db.query(models.Union.id).filter(models.Union.id == event_in.union_id).first():
+        raise HTTPException(status_code=404, detail="Union not found")
     
     event.title = event_in.title
     event.description = event_in.description
@@ -81,7 +93,7 @@ def update_event(
     
     db.commit()
     db.refresh(event)
-    event.attendee_count = len(event.attendees)
+    response_cache.invalidate("events")
     return event
 
 
@@ -89,7 +101,7 @@ def update_event(
 def delete_event(
     event_id: int, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     event = db.query(models.Event).filter(models.Event.id == event_id).first()
     if not event:
@@ -101,71 +113,137 @@ def delete_event(
     
     db.delete(event)
     db.commit()
+    response_cache.invalidate("events")
     return {"message": "Event deleted successfully"}
 
 
+BULK_RSVP_LIMIT = 1000
+
+
+def _add_attendees(db: Session, event_id: int, user_ids: List[int]):
+    """RSVP ``user_ids`` to an event and return (rows added, attendee count).
+
+    One INSERT ... SELECT ... ON CONFLICT DO NOTHING on (event_id, user_id):
+    existing RSVPs and unknown user ids are skipped, so repeats and concurrent
+    double-taps are harmless. The count, kept by the attendee triggers, is
+    read back before committing. Returns None, writing nothing, if the event
+    does not exist.
+    """
+    insert = conflict_insert(db, models.EventAttendee.__table__)
+    attendees = select(models.Event.id, models.User.id, literal(datetime.utcnow())).join(
+        models.User, models.User.id.in_(user_ids)
+    ).where(models.Event.id == event_id)
+    statement = insert.from_select(["event_id", "user_id", "created_at"], attendees).on_conflict_do_nothing(
+        index_elements=["event_id", "user_id"]
+    )
+    added = db.execute(statement).rowcount
+    attendee_count = db.query(models.Event.attendee_count).filter(models.Event.id == event_id).scalar()
+    if attendee_count is None:
+        db.rollback()
+        return None
+    db.commit()
+    if added:
+        response_cache.invalidate("events")
+    return added, attendee_count
+
+
 @router.post("/{event_id}/rsvp")
 def rsvp_to_event(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+    """RSVP to an event. Idempotent: RSVPing again leaves the existing RSVP alone."""
+    result = _add_attendees(db, event_id, [current_user.id])
+    if result is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check if already RSVP'd
-    existing = db.query(models.EventAttendee).filter(
-        models.EventAttendee.event_id == event_id,
-        models.EventAttendee.user_id == current_user.id
-    ).first()
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="Already RSVP'd to this event")
-    
-    attendee = models.EventAttendee(
-        event_id=event_id,
-        user_id=current_user.id
-    )
-    db.add(attendee)
-    db.commit()
-    
-    return {"message": "RSVP successful", "attendee_count": len(event.attendees)}
+    return {"message": "RSVP successful", "attendee_count": result[1]}
+
+
+@router.post("/{event_id}/rsvp/bulk", dependencies=[Depends(require_roles(["organizer", "admin"]))])
+def bulk_rsvp_to_event(event_id: int, rsvp_in: schemas.EventBulkRSVP, db: Session = Depends(get_db)):
+    """Register a list of users for an event in one transaction; unknown ids and existing RSVPs are skipped."""
+    if not rsvp_in.user_ids:
+        raise HTTPException(status_code=400, detail="user_ids must not be empty")
+    if len(rsvp_in.user_ids) > BULK_RSVP_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_RSVP_LIMIT} user_ids per request")
+    result = _add_attendees(db, event_id, rsvp_in.user_ids)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    added, attendee_count = result
+    return {"message": "RSVPs registered", "added": added, "attendee_count": attendee_count}
 
 
 @router.delete("/{event_id}/rsvp")
 def cancel_rsvp(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    attendee = db.query(models.EventAttendee).filter(
+    """Cancel an RSVP. Idempotent: cancelling without an RSVP changes nothing."""
+    removed = db.execute(delete(models.EventAttendee).where(
         models.EventAttendee.event_id == event_id,
-        models.EventAttendee.user_id == current_user.id
-    ).first()
-    
-    if not attendee:
-        raise HTTPException(status_code=404, detail="RSVP not found")
-    
-    db.delete(attendee)
+        models.EventAttendee.user_id == current_user.id,
+    )).rowcount
+    attendee_count = db.query(models.Event.attendee_count).filter(models.Event.id == event_id).scalar()
+    if attendee_count is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Event not found")
     db.commit()
-    
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    return {"message": "RSVP cancelled", "attendee_count": len(event.attendees) if event else 0}
+    if removed:
+        response_cache.invalidate("events")
+    return {"message": "RSVP cancelled", "attendee_count": attendee_count}
+
+
+def _attendees_marker(db: Session, event_id: int) -> tuple:
+    """Version marker: changes whenever an RSVP is added or cancelled."""
+    return tuple(db.query(
+        func.count(models.EventAttendee.id),
+        func.max(models.EventAttendee.id),
+        func.max(models.EventAttendee.created_at),
+        func.sum(models.EventAttendee.user_id),
+    ).filter(models.EventAttendee.event_id == event_id).one())
+
+
+def _attendees_page(event_id: int, cursor: Optional[str], skip: int, limit: int):
+    """One page of an event's attendees as (user_id, username) in RSVP order, in a single joined query."""
+    statement = select(
+        models.EventAttendee.user_id, models.User.username, models.EventAttendee.created_at, models.EventAttendee.id
+    ).join(models.User, models.User.id == models.EventAttendee.user_id).where(
+        models.EventAttendee.event_id == event_id
+    )
+    return paginate(statement, models.EventAttendee.created_at, models.EventAttendee.id, cursor, skip, limit)
+
+
+def _attendees_body(event_id: int, attendee_count: int, rows=None) -> dict:
+    body = {"event_id": event_id, "attendee_count": attendee_count}
+    if rows is not None:
+        body["attendees"] = [{"user_id": row.user_id, "username": row.username} for row in rows]
+    return body
 
 
 @router.get("/{event_id}/attendees")
-def get_event_attendees(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+def get_event_attendees(
+    event_id: int,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    count_only: bool = False,
+    db: Session = Depends(get_read_db)
+):
+    """Attendees in RSVP order, paginated; count_only=true returns just the count."""
+    attendee_count = db.query(models.Event.attendee_count).filter(models.Event.id == event_id).scalar()
+    if attendee_count is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    
-    attendees = db.query(models.EventAttendee).filter(
-        models.EventAttendee.event_id == event_id
-    ).all()
-    
-    return {
-        "event_id": event_id,
-        "attendee_count": len(attendees),
-        "attendees": [{"user_id": a.user_id, "username": a.user.username} for a in attendees]
-    }
+
+    not_modified = check_etag(request, response, event_id, *_attendees_marker(db, event_id))
+    if not_modified:
+        return not_modified
+    if count_only:
+        return _attendees_body(event_id, attendee_count)
+
+    rows = db.execute(_attendees_page(event_id, cursor, skip, limit)).all()
+    set_next_cursor(response, rows, limit, key=lambda row: (row.created_at, row.id))
+    return _attendees_body(event_id, attendee_count, rows)
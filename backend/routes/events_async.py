@@ -0,0 +1,69 @@
+"""
+Async read handlers for events, mounted ahead of events.router when DB_MODE=async.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+
+from .. import models, schemas
+from ..db import get_async_db
+from ..etag import check_etag
+from ..pagination import paginate, set_next_cursor
+from .events import _attendees_body, _attendees_marker, _attendees_page
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas.Event])
+async def list_events(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    statement = select(models.Event).options(selectinload(models.Event.creator))
+    events = (await db.scalars(paginate(
+        statement, models.Event.start_time, models.Event.id, cursor, skip, limit, descending=True
+    ))).all()
+    set_next_cursor(response, events, limit, key=lambda e: (e.start_time, e.id))
+    return events
+
+
+@router.get("/{event_id}", response_model=schemas.Event)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    event = await db.scalar(
+        select(models.Event).options(selectinload(models.Event.creator)).where(models.Event.id == event_id)
+    )
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
+@router.get("/{event_id}/attendees")
+async def get_event_attendees(
+    event_id: int,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    count_only: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    attendee_count = await db.scalar(select(models.Event.attendee_count).where(models.Event.id == event_id))
+    if attendee_count is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    marker = await db.run_sync(_attendees_marker, event_id)
+    not_modified = check_etag(request, response, event_id, *marker)
+    if not_modified:
+        return not_modified
+    if count_only:
+        return _attendees_body(event_id, attendee_count)
+
+    rows = (await db.execute(_attendees_page(event_id, cursor, skip, limit))).all()
+    set_next_cursor(response, rows, limit, key=lambda row: (row.created_at, row.id))
+    return _attendees_body(event_id, attendee_count, rows)
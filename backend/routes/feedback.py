@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from .. import models, schemas
-from ..db import get_db, engine
-from ..security import get_current_user
+from ..cache import response_cache
+from ..db import get_db, get_read_db, engine
+from ..pagination import paginate, set_next_cursor
+from ..security import Principal, get_current_principal
 
 models.Base.metadata.create_all(bind=engine)
 
@@ -12,7 +14,7 @@ router = APIRouter()
 
 
 @router.post("/", response_model=schemas.Feedback)
-def create_general_feedback(feedback: schemas.FeedbackCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def create_general_feedback(feedback: schemas.FeedbackCreate, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     """Create general feedback not tied to a specific post"""
     new = models.Feedback(post_id=None, message=feedback.message, anonymous=feedback.anonymous)
     db.add(new)
@@ -22,7 +24,7 @@ def create_general_feedback(feedback: schemas.FeedbackCreate, db: Session = Depe
 
 
 @router.post("/post/{post_id}", response_model=schemas.Feedback)
-def create_feedback_for_post(post_id: int, feedback: schemas.FeedbackCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def create_feedback_for_post(post_id: int, feedback: schemas.FeedbackCreate, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     p = db.query(models.Post).filter(models.Post.id == post_id).first()
     if not p:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -30,16 +32,27 @@ def create_feedback_for_post(post_id: int, feedback: schemas.FeedbackCreate, db:
     db.add(new)
     db.commit()
     db.refresh(new)
+    response_cache.invalidate(f"posts:{p.union_id}", "unions")
     return new
 
 
 @router.get("/post/{post_id}", response_model=List[schemas.Feedback])
-def list_feedback_for_post(post_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(models.Feedback).filter(models.Feedback.post_id == post_id).offset(skip).limit(limit).all()
+def list_feedback_for_post(
+    post_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    query = db.query(models.Feedback).filter(models.Feedback.post_id == post_id)
+    feedbacks = paginate(query, models.Feedback.created_at, models.Feedback.id, cursor, skip, limit).all()
+    set_next_cursor(response, feedbacks, limit, key=lambda f: (f.created_at, f.id))
+    return feedbacks
 
 
 @router.get("/{feedback_id}", response_model=schemas.Feedback)
-def get_feedback(feedback_id: int, db: Session = Depends(get_db)):
+def get_feedback(feedback_id: int, db: Session = Depends(get_read_db)):
     feedback = db.query(models.Feedback).filter(models.Feedback.id == feedback_id).first()
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from .. import db as database
+from ..broker import broker
+from ..cache import response_cache
+from ..pool import pool_stats
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metrics():
+    """Runtime counters for monitoring - no authentication required"""
+    metrics = {
+        "response_cache": response_cache.stats(),
+        "streams": broker.stats(),
+        "db_pool": pool_stats(database.engine.pool),
+    }
+    if database.read_engine is not database.engine:
+        metrics["read_db_pool"] = pool_stats(database.read_engine.pool)
+    if database.async_engine is not None:
+        metrics["async_db_pool"] = pool_stats(database.async_engine.sync_engine.pool)
+    return metrics
@@ -1,11 +1,19 @@
-from collections import Counter
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, literal, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from .. import models, schemas
-from ..db import get_db
-from ..security import require_roles, get_current_user
+from ..broker import SSE_HEADERS, SlowConsumer, broker, next_message, sse_event
+from ..db import get_db, get_read_db
+from ..dialects import conflict_insert
+from ..etag import check_etag
+from ..pagination import paginate, set_next_cursor
+from ..security import Principal, require_roles, get_current_principal
 
 router = APIRouter()
 
@@ -14,6 +22,8 @@ router = APIRouter()
 def create_poll(poll_in: schemas.PollCreate, db: Session = Depends(get_db)):
     if not poll_in.options or len(poll_in.options) < 2:
         raise HTTPException(status_code=400, detail="A poll requires at least two options")
+    if poll_in.union_id is not None and not db.query(models.Union.id).filter(models.Union.id == poll_in.union_id).first():
+        raise HTTPException(status_code=404, detail="Union not found")
     poll = models.Poll(question=poll_in.question, union_id=poll_in.union_id)
     db.add(poll)
     db.flush()  # get poll.id before adding options
@@ -25,38 +35,153 @@ def create_poll(poll_in: schemas.PollCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[schemas.Poll])
-def list_polls(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
-    return db.query(models.Poll).order_by(models.Poll.created_at.desc()).offset(skip).limit(limit).all()
+def list_polls(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    polls = paginate(
+        db.query(models.Poll), models.Poll.created_at, models.Poll.id, cursor, skip, limit, descending=True
+    ).all()
+    set_next_cursor(response, polls, limit, key=lambda p: (p.created_at, p.id))
+    return polls
 
 
 @router.post("/{poll_id}/vote", response_model=schemas.PollResults)
-def vote_poll(poll_id: int, vote_in: schemas.VoteCreate, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
-    option = db.query(models.PollOption).filter(models.PollOption.id == vote_in.option_id, models.PollOption.poll_id == poll_id).first()
-    if not option:
-        raise HTTPException(status_code=404, detail="Option not found for this poll")
-
-    # check if already voted
-    already = db.query(models.Vote).filter(models.Vote.poll_id == poll_id, models.Vote.user_id == user.id).first()
-    if already:
+def vote_poll(poll_id: int, vote_in: schemas.VoteCreate, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
+    # One statement: the SELECT only yields a row if the option belongs to
+    # this poll, and uq_poll_user turns a repeat vote into a no-op instead of
+    # a check-then-insert race.
+    insert = conflict_insert(db, models.Vote.__table__)
+    chosen_option = select(
+        models.PollOption.poll_id,
+        models.PollOption.id,
+        literal(user.id),
+        literal(datetime.utcnow()),
+    ).where(models.PollOption.id == vote_in.option_id, models.PollOption.poll_id == poll_id)
+    statement = insert.from_select(["poll_id", "option_id", "user_id", "created_at"], chosen_option).on_conflict_do_nothing(
+        index_elements=["poll_id", "user_id"]
+    )
+    try:
+        inserted = db.execute(statement).rowcount
+    except IntegrityError:
+        db.rollback()
+        if db.query(models.User.id).filter(models.User.id == user.id).first() is None:
+            # Deleted account whose token has not been rejected yet
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+        raise
+    if inserted == 0:
+        db.rollback()
+        # Nothing inserted: tell a bad option apart from a repeat vote
+        option_exists = db.query(models.PollOption.id).filter(
+            models.PollOption.id == vote_in.option_id, models.PollOption.poll_id == poll_id
+        ).first()
+        if not option_exists:
+            raise HTTPException(status_code=404, detail="Option not found for this poll")
         raise HTTPException(status_code=400, detail="User already voted in this poll")
-
-    vote = models.Vote(poll_id=poll_id, option_id=option.id, user_id=user.id)
-    db.add(vote)
     db.commit()
 
-    return poll_results(poll_id, db)
+    results = _poll_results(db, poll_id)
+    # Live viewers reuse this tally instead of each re-running it
+    broker.publish(f"poll:{poll_id}", results, coalesce_key="results")
+    return results
 
 
 @router.get("/{poll_id}/results", response_model=schemas.PollResults)
-def poll_results(poll_id: int, db: Session = Depends(get_db)):
-    poll = db.query(models.Poll).filter(models.Poll.id == poll_id).first()
-    if not poll:
+def poll_results(poll_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    not_modified = check_etag(request, response, poll_id, *_votes_marker(db, poll_id))
+    if not_modified:
+        return not_modified
+    return _poll_results(db, poll_id)
+
+
+@router.get("/{poll_id}/stream")
+async def stream_poll_results(poll_id: int, db: Session = Depends(get_read_db)):
+    """Live results as Server-Sent Events - no authentication required.
+
+    Sends a ``snapshot`` event with the full results, then a ``delta`` event
+    listing the options whose tallies changed whenever votes come in (bursts
+    are coalesced), and keep-alive comments while idle.
+    """
+    # Subscribe before reading the snapshot so no vote falls in between
+    subscription = broker.subscribe(f"poll:{poll_id}")
+    try:
+        snapshot = await run_in_threadpool(_poll_results, db, poll_id)
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+    finally:
+        # Don't hold a pooled connection for the lifetime of the stream
+        await run_in_threadpool(db.close)
+    return StreamingResponse(
+        _poll_events(subscription, snapshot), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+async def _poll_events(subscription, snapshot: schemas.PollResults):
+    try:
+        yield sse_event("snapshot", snapshot)
+        seen = {option.option_id: option.votes for option in snapshot.results}
+        while True:
+            results = await next_message(subscription)
+            if results is None:
+                yield ": keepalive\n\n"
+                continue
+            changes = [
+                {**option.model_dump(), "delta": option.votes - seen.get(option.option_id, 0)}
+                for option in results.results
+                if option.votes != seen.get(option.option_id, 0)
+            ]
+            if not changes:
+                continue
+            seen = {option.option_id: option.votes for option in results.results}
+            yield sse_event("delta", {"poll_id": results.poll_id, "total_votes": results.total_votes, "changes": changes})
+    except SlowConsumer:
+        # Fell too far behind; ending the stream makes the client reconnect to a fresh snapshot
+        return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def _votes_marker(db: Session, poll_id: int) -> tuple:
+    """Version marker: changes whenever a vote is added or removed."""
+    return tuple(db.query(
+        func.count(models.Vote.id),
+        func.max(models.Vote.id),
+        func.max(models.Vote.created_at),
+        func.sum(models.Vote.option_id),
+    ).filter(models.Vote.poll_id == poll_id).one())
+
+
+def _poll_results(db: Session, poll_id: int) -> schemas.PollResults:
+    """Tally a poll with one grouped query; only one row per option leaves the database."""
+    rows = db.query(
+        models.Poll.question,
+        models.PollOption.id,
+        models.PollOption.text,
+        func.count(models.Vote.id),
+    ).select_from(models.Poll).outerjoin(
+        models.PollOption, models.PollOption.poll_id == models.Poll.id
+    ).outerjoin(
+        # (poll_id, option_id) is covered by ix_votes_poll_option
+        models.Vote, and_(models.Vote.poll_id == models.Poll.id, models.Vote.option_id == models.PollOption.id)
+    ).filter(models.Poll.id == poll_id).group_by(
+        models.Poll.question, models.PollOption.id, models.PollOption.text
+    ).order_by(models.PollOption.id).all()
+    if not rows:
         raise HTTPException(status_code=404, detail="Poll not found")
-    options = db.query(models.PollOption).filter(models.PollOption.poll_id == poll_id).all()
-    votes = db.query(models.Vote).filter(models.Vote.poll_id == poll_id).all()
 
-    counts = Counter([v.option_id for v in votes])
+    total = sum(votes for _, option_id, _, votes in rows if option_id is not None)
     result_options = [
-        schemas.PollResultOption(option_id=o.id, text=o.text, votes=counts.get(o.id, 0)) for o in options
+        schemas.PollResultOption(
+            option_id=option_id,
+            text=text,
+            votes=votes,
+            percentage=round(100.0 * votes / total, 1) if total else 0.0,
+        )
+        for _, option_id, text, votes in rows
+        if option_id is not None
     ]
-    return schemas.PollResults(poll_id=poll.id, question=poll.question, results=result_options)
+    return schemas.PollResults(poll_id=poll_id, question=rows[0][0], total_votes=total, results=result_options)
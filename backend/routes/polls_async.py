@@ -0,0 +1,41 @@
+"""
+Async read handlers for polls, mounted ahead of polls.router when DB_MODE=async.
+"""
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+
+from .. import models, schemas
+from ..db import get_async_db
+from ..etag import check_etag
+from ..pagination import paginate, set_next_cursor
+from .polls import _poll_results, _votes_marker
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas.Poll])
+async def list_polls(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    statement = select(models.Poll).options(selectinload(models.Poll.options))
+    polls = (await db.scalars(paginate(
+        statement, models.Poll.created_at, models.Poll.id, cursor, skip, limit, descending=True
+    ))).all()
+    set_next_cursor(response, polls, limit, key=lambda p: (p.created_at, p.id))
+    return polls
+
+
+@router.get("/{poll_id}/results", response_model=schemas.PollResults)
+async def poll_results(poll_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    marker = await db.run_sync(_votes_marker, poll_id)
+    not_modified = check_etag(request, response, poll_id, *marker)
+    if not_modified:
+        return not_modified
+    return await db.run_sync(_poll_results, poll_id)
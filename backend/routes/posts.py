@@ -1,18 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, noload, selectinload
+from typing import List, Optional, Set, Tuple
 
 from .. import models, schemas
-from ..db import get_db, engine
-from ..security import require_roles, get_current_user, get_current_user_optional
+from ..broker import SSE_HEADERS, SlowConsumer, broker, next_message, sse_event
+from ..cache import response_cache
+from ..db import get_db, get_read_db, engine
+from ..dialects import conflict_insert
+from ..etag import check_etag
+from ..pagination import paginate, set_next_cursor
+from ..security import Principal, get_current_principal
 
 models.Base.metadata.create_all(bind=engine)
 
 router = APIRouter()
 
+# Relationships that are only loaded and serialized when asked for via expand=
+EXPANDABLE_POST_FIELDS = {"comments", "feedbacks"}
+# In schema order, so sparse responses list their keys the same way every time
+POST_FIELDS = tuple(schemas.Post.model_fields)
+
+
+def _parse_csv(value: str) -> Set[str]:
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def _post_fieldset(fields: Optional[str], expand: Optional[str]) -> Tuple[Set[str], Set[str]]:
+    """Resolve fields=/expand= into (fields to return, relationships to load).
+
+    With neither parameter, comments and feedbacks are expanded as before.
+    Once fields= is given it is the complete answer: only the relationships it
+    names are expanded, plus any listed in expand=. An empty expand= skips both.
+    """
+    if expand is None:
+        expanded = EXPANDABLE_POST_FIELDS if fields is None else set()
+    else:
+        expanded = _parse_csv(expand)
+    unknown = expanded - EXPANDABLE_POST_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot expand: {', '.join(sorted(unknown))}")
+
+    if fields is None:
+        selected = (set(POST_FIELDS) - EXPANDABLE_POST_FIELDS) | expanded
+    else:
+        selected = _parse_csv(fields)
+        unknown = selected - set(POST_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        expanded = expanded | (selected & EXPANDABLE_POST_FIELDS)
+        selected = selected | expanded
+    return selected, expanded
+
+
+def _post_load_options(expanded: Set[str]) -> list:
+    """selectinload the expanded relationships and never load the others."""
+    return [
+        selectinload(models.Post.feedbacks) if "feedbacks" in expanded else noload(models.Post.feedbacks),
+        selectinload(models.Post.comments).selectinload(models.Comment.user)
+        if "comments" in expanded else noload(models.Post.comments),
+    ]
+
+
+def _invalidate_feed(union_id: Optional[int]) -> None:
+    """Drop cached feed pages (and union listings embedding posts) for a union."""
+    response_cache.invalidate(f"posts:{union_id}", "unions")
+
+
+def _publish(post_id: int, event: str, data, coalesce_key: Optional[str] = None) -> None:
+    """Push ``event`` to live viewers of the post (see stream_post)."""
+    broker.publish(f"post:{post_id}", (event, data), coalesce_key=coalesce_key)
+
+
+def _feed_version(db: Session, union_id: int) -> tuple:
+    """Cheap marker that changes whenever anything shown in a union's feed does."""
+    post_ids = db.query(models.Post.id).filter(models.Post.union_id == union_id).scalar_subquery()
+    posts = db.query(
+        func.count(models.Post.id),
+        func.max(models.Post.id),
+        func.sum(models.Post.upvotes),
+        func.sum(models.Post.downvotes),
+        # Weighting by id tells apart votes moving between posts
+        func.sum(models.Post.upvotes * models.Post.id),
+        func.sum(models.Post.downvotes * models.Post.id),
+    ).filter(models.Post.union_id == union_id)
+    comments = db.query(
+        func.count(models.Comment.id),
+        func.max(models.Comment.id),
+        func.max(models.Comment.updated_at),
+    ).filter(models.Comment.post_id.in_(post_ids))
+    feedbacks = db.query(
+        func.count(models.Feedback.id),
+        func.max(models.Feedback.id),
+    ).filter(models.Feedback.post_id.in_(post_ids))
+    return tuple(posts.one()) + tuple(comments.one()) + tuple(feedbacks.one())
+
+
+def _sparse_post(post: models.Post, selected: Set[str]) -> dict:
+    data = {}
+    for name in POST_FIELDS:
+        if name not in selected:
+            continue
+        if name == "comments":
+            data[name] = [schemas.Comment.model_validate(c) for c in post.comments]
+        elif name == "feedbacks":
+            data[name] = [schemas.Feedback.model_validate(f) for f in post.feedbacks]
+        else:
+            data[name] = getattr(post, name)
+    return data
+
 
 @router.post("/union/{union_id}", response_model=schemas.Post)
-def create_post_for_union(union_id: int, post: schemas.PostCreate, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
+def create_post_for_union(union_id: int, post: schemas.PostCreate, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     """Create a post in a union. All authenticated users can create posts."""
     u = db.query(models.Union).filter(models.Union.id == union_id).first()
     if not u:
@@ -21,53 +126,177 @@ def create_post_for_union(union_id: int, post: schemas.PostCreate, db: Session =
     db.add(new)
     db.commit()
     db.refresh(new)
-    # Initialize vote counts for new post
-    new.upvotes = 0
-    new.downvotes = 0
+    _invalidate_feed(union_id)
     return new
 
 
-@router.get("/union/{union_id}", response_model=List[schemas.Post])
-def list_posts_for_union(union_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List posts in a union - no authentication required for viewing"""
-    posts = db.query(models.Post).filter(models.Post.union_id == union_id).offset(skip).limit(limit).all()
-    
-    # Add vote counts to each post
-    for post in posts:
-        upvotes = db.query(models.PostVote).filter(
-            models.PostVote.post_id == post.id,
-            models.PostVote.vote_type == "up"
-        ).count()
-        downvotes = db.query(models.PostVote).filter(
-            models.PostVote.post_id == post.id,
-            models.PostVote.vote_type == "down"
-        ).count()
-        post.upvotes = upvotes
-        post.downvotes = downvotes
-    
-    return posts
+@router.get(
+    "/union/{union_id}",
+    response_model=List[typing.Union[schemas.Post, schemas.PostSparse]],
+    response_model_exclude_unset=True,
+)
+def list_posts_for_union(
+    union_id: int,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """List posts in a union, newest first - no authentication required for viewing.
+
+    fields= limits the returned attributes (comma-separated) and loads only the
+    relationships it names; expand= picks which of comments,feedbacks to load.
+    With neither, the full post is returned.
+    """
+    selected, expanded = _post_fieldset(fields, expand)
+    not_modified = check_etag(request, response, union_id, *_feed_version(db, union_id))
+    if not_modified:
+        return not_modified
+
+    query = db.query(models.Post).options(*_post_load_options(expanded)).filter(
+        models.Post.union_id == union_id
+    )
+    posts = paginate(
+        query, models.Post.created_at, models.Post.id, cursor, skip, limit, descending=True
+    ).all()
+
+    set_next_cursor(response, posts, limit, key=lambda p: (p.created_at, p.id))
+    if fields is None and expand is None:
+        return posts
+    return [_sparse_post(p, selected) for p in posts]
 
 
-@router.get("/{post_id}", response_model=schemas.Post)
-def get_post(post_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/{post_id}",
+    response_model=typing.Union[schemas.Post, schemas.PostSparse],
+    response_model_exclude_unset=True,
+)
+def get_post(
+    post_id: int,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """Get a single post - no authentication required for viewing"""
-    p = db.query(models.Post).filter(models.Post.id == post_id).first()
+    selected, expanded = _post_fieldset(fields, expand)
+    p = db.query(models.Post).options(*_post_load_options(expanded)).filter(
+        models.Post.id == post_id
+    ).first()
     if not p:
         raise HTTPException(status_code=404, detail="Post not found")
-    
-    # Add vote counts
-    upvotes = db.query(models.PostVote).filter(
-        models.PostVote.post_id == p.id,
-        models.PostVote.vote_type == "up"
-    ).count()
-    downvotes = db.query(models.PostVote).filter(
-        models.PostVote.post_id == p.id,
-        models.PostVote.vote_type == "down"
-    ).count()
-    p.upvotes = upvotes
-    p.downvotes = downvotes
-    
-    return p
+
+    if fields is None and expand is None:
+        return p
+    return _sparse_post(p, selected)
+
+
+@router.get("/{post_id}/stream")
+async def stream_post(post_id: int, db: Session = Depends(get_read_db)):
+    """Live post activity as Server-Sent Events - no authentication required.
+
+    Sends a ``snapshot`` event with the current vote tally, then
+    ``comment_created``, ``comment_updated`` and ``comment_deleted`` events as
+    they happen and a ``votes`` event when the tally changes (bursts are
+    coalesced). A client that falls too far behind is disconnected.
+    """
+    # Subscribe before reading the snapshot so no change falls in between
+    subscription = broker.subscribe(f"post:{post_id}")
+    try:
+        snapshot = await run_in_threadpool(_vote_tally, db, post_id)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+    finally:
+        # Don't hold a pooled connection for the lifetime of the stream
+        await run_in_threadpool(db.close)
+    return StreamingResponse(
+        _post_events(subscription, snapshot), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+async def _post_events(subscription, snapshot: dict):
+    try:
+        yield sse_event("snapshot", snapshot)
+        while True:
+            message = await next_message(subscription)
+            yield ": keepalive\n\n" if message is None else sse_event(*message)
+    except SlowConsumer:
+        # Fell too far behind; ending the stream makes the client reconnect to a fresh snapshot
+        return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def _vote_tally(db: Session, post_id: int) -> Optional[dict]:
+    tally = db.query(models.Post.upvotes, models.Post.downvotes).filter(models.Post.id == post_id).first()
+    if tally is None:
+        return None
+    return {"post_id": post_id, "upvotes": tally.upvotes, "downvotes": tally.downvotes}
+
+
+def _cast_vote(db: Session, post_id: int, user_id: int, vote_type: str):
+    """Record ``user_id``'s vote on a post and return (union_id, upvotes, downvotes).
+
+    The vote is one INSERT ... ON CONFLICT DO UPDATE on (post_id, user_id),
+    so concurrent votes by the same user cannot race into duplicates; the
+    counter triggers update the post's tallies in the same statement. The
+    tallies are read back before committing. Returns None, writing nothing,
+    if the post does not exist; raises 401 if the voter no longer does.
+    """
+    insert = conflict_insert(db, models.PostVote.__table__)
+    statement = insert.values(
+        post_id=post_id, user_id=user_id, vote_type=vote_type, created_at=datetime.utcnow()
+    ).on_conflict_do_update(
+        index_elements=["post_id", "user_id"],
+        set_={"vote_type": insert.excluded.vote_type},
+        # Re-casting the same vote leaves the row and the counters alone
+        where=models.PostVote.__table__.c.vote_type != insert.excluded.vote_type,
+    )
+    try:
+        db.execute(statement)
+    except IntegrityError:
+        db.rollback()
+        if db.query(models.Post.id).filter(models.Post.id == post_id).first() is None:
+            return None
+        if db.query(models.User.id).filter(models.User.id == user_id).first() is None:
+            # Deleted account whose token has not been rejected yet
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+        raise
+    tally = db.query(models.Post.union_id, models.Post.upvotes, models.Post.downvotes).filter(
+        models.Post.id == post_id
+    ).first()
+    if tally is None:
+        db.rollback()
+        return None
+    db.commit()
+    return tally
+
+
+@router.post("/{post_id}/vote", response_model=schemas.PostVoteTally)
+def vote_post(
+    post_id: int,
+    vote: schemas.PostVoteCreate,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal)
+):
+    """Upvote or downvote a post; voting again replaces the earlier vote."""
+    tally = _cast_vote(db, post_id, user.id, vote.vote_type)
+    if tally is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    _invalidate_feed(tally.union_id)
+    _publish(
+        post_id, "votes", {"post_id": post_id, "upvotes": tally.upvotes, "downvotes": tally.downvotes},
+        coalesce_key="votes",
+    )
+    return schemas.PostVoteTally(
+        post_id=post_id, vote_type=vote.vote_type, upvotes=tally.upvotes, downvotes=tally.downvotes
+    )
 
 
 # Comment endpoints
@@ -76,7 +305,7 @@ def create_comment(
     post_id: int,
     comment: schemas.CommentCreate,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    user: Principal = Depends(get_current_principal)
 ):
     """Create a comment on a post. All authenticated users can comment."""
     post = db.query(models.Post).filter(models.Post.id == post_id).first()
@@ -91,25 +320,28 @@ def create_comment(
     db.add(new_comment)
     db.commit()
     db.refresh(new_comment)
+    _invalidate_feed(post.union_id)
+    _publish(post_id, "comment_created", schemas.Comment.model_validate(new_comment))
     return new_comment
 
 
 @router.get("/{post_id}/comments", response_model=List[schemas.Comment])
 def get_comments(
     post_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """Get all comments for a post - no authentication required for viewing"""
     post = db.query(models.Post).filter(models.Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    comments = db.query(models.Comment).filter(
-        models.Comment.post_id == post_id
-    ).order_by(models.Comment.created_at.asc()).offset(skip).limit(limit).all()
-    
+    query = db.query(models.Comment).filter(models.Comment.post_id == post_id)
+    comments = paginate(query, models.Comment.created_at, models.Comment.id, cursor, skip, limit).all()
+    set_next_cursor(response, comments, limit, key=lambda c: (c.created_at, c.id))
     return comments
 
 
@@ -118,7 +350,7 @@ def update_comment(
     comment_id: int,
     comment_update: schemas.CommentUpdate,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    user: Principal = Depends(get_current_principal)
 ):
     """Update a comment. Only the comment author can edit."""
     comment = db.query(models.Comment).filter(models.Comment.id == comment_id).first()
@@ -131,6 +363,8 @@ def update_comment(
     comment.content = comment_update.content
     db.commit()
     db.refresh(comment)
+    _invalidate_feed(comment.post.union_id)
+    _publish(comment.post_id, "comment_updated", schemas.Comment.model_validate(comment))
     return comment
 
 
@@ -138,7 +372,7 @@ def update_comment(
 def delete_comment(
     comment_id: int,
     db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    user: Principal = Depends(get_current_principal)
 ):
     """Delete a comment. Only the comment author or admin can delete."""
     comment = db.query(models.Comment).filter(models.Comment.id == comment_id).first()
@@ -148,7 +382,10 @@ def delete_comment(
     if comment.user_id != user.id and user.role != "admin":
         raise HTTPException(status_code=403, detail="You can only delete your own comments")
     
+    union_id, post_id = comment.post.union_id, comment.post_id
     db.delete(comment)
     db.commit()
+    _invalidate_feed(union_id)
+    _publish(post_id, "comment_deleted", {"id": comment_id, "post_id": post_id})
     return None
 
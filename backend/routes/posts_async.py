@@ -0,0 +1,105 @@
+"""
+Async read handlers for posts, mounted ahead of posts.router when DB_MODE=async.
+
+Same paths, parameters and responses as the sync handlers. Relationships are
+always eager-loaded, since lazy loads cannot run on an AsyncSession.
+"""
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+
+from .. import models, schemas
+from ..db import get_async_db
+from ..etag import check_etag
+from ..pagination import paginate, set_next_cursor
+from .posts import _feed_version, _post_fieldset, _post_load_options, _sparse_post
+
+router = APIRouter()
+
+
+@router.get(
+    "/union/{union_id}",
+    response_model=List[typing.Union[schemas.Post, schemas.PostSparse]],
+    response_model_exclude_unset=True,
+)
+async def list_posts_for_union(
+    union_id: int,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List posts in a union, newest first - no authentication required for viewing."""
+    selected, expanded = _post_fieldset(fields, expand)
+    marker = await db.run_sync(_feed_version, union_id)
+    not_modified = check_etag(request, response, union_id, *marker)
+    if not_modified:
+        return not_modified
+
+    statement = select(models.Post).options(*_post_load_options(expanded)).where(
+        models.Post.union_id == union_id
+    )
+    posts = (await db.scalars(paginate(
+        statement, models.Post.created_at, models.Post.id, cursor, skip, limit, descending=True
+    ))).all()
+
+    set_next_cursor(response, posts, limit, key=lambda p: (p.created_at, p.id))
+    if fields is None and expand is None:
+        return posts
+    return [_sparse_post(p, selected) for p in posts]
+
+
+@router.get(
+    "/{post_id}",
+    response_model=typing.Union[schemas.Post, schemas.PostSparse],
+    response_model_exclude_unset=True,
+)
+async def get_post(
+    post_id: int,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a single post - no authentication required for viewing"""
+    selected, expanded = _post_fieldset(fields, expand)
+    p = await db.scalar(
+        select(models.Post).options(*_post_load_options(expanded)).where(models.Post.id == post_id)
+    )
+    if not p:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    if fields is None and expand is None:
+        return p
+    return _sparse_post(p, selected)
+
+
+@router.get("/{post_id}/comments", response_model=List[schemas.Comment])
+async def get_comments(
+    post_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all comments for a post - no authentication required for viewing"""
+    post = await db.get(models.Post, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    statement = select(models.Comment).options(selectinload(models.Comment.user)).where(
+        models.Comment.post_id == post_id
+    )
+    comments = (await db.scalars(paginate(
+        statement, models.Comment.created_at, models.Comment.id, cursor, skip, limit
+    ))).all()
+    set_next_cursor(response, comments, limit, key=lambda c: (c.created_at, c.id))
+    return comments
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from .. import schemas
+from .. import search as full_text
+from ..db import get_read_db
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas.SearchResult])
+def search(
+    q: str = Query(..., min_length=1),
+    kinds: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Ranked full-text search over unions, posts and comments.
+
+    kinds= narrows results to a comma-separated subset of union,post,comment.
+    No authentication required.
+    """
+    kind_list = None
+    if kinds:
+        kind_list = [k.strip() for k in kinds.split(",") if k.strip()]
+        unknown = set(kind_list) - set(full_text.KIND_CODES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(sorted(unknown))}")
+    return full_text.search(db, q, kinds=kind_list, skip=skip, limit=limit)
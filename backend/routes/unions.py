@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
+from typing import Dict, List, Literal, Optional, Set
 
 from .. import models, schemas
-from ..db import get_db, engine
-from ..security import require_roles, get_current_user, get_current_user_optional
+from .. import search as full_text
+from ..cache import response_cache
+from ..db import get_db, get_read_db, engine
+from ..pagination import paginate, set_next_cursor
+from ..security import Principal, require_roles, get_current_principal, get_current_principal_optional
 
 # Ensure tables exist when router is imported in simple setups
 models.Base.metadata.create_all(bind=engine)
@@ -27,50 +32,74 @@ def create_union(union: schemas.UnionCreate, db: Session = Depends(get_db)):
     db.add(new)
     db.commit()
     db.refresh(new)
+    response_cache.invalidate("unions")
     return new
 
 
-@router.get("/", response_model=List[schemas.Union])
-def list_unions(
-    skip: int = 0, 
-    limit: int = 100, 
-    industry: Optional[str] = None,
-    search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(get_current_user_optional)
-):
-    query = db.query(models.Union)
-    
+def _member_counts(db: Session, union_ids: List[int]) -> Dict[int, int]:
+    """Member count per union for all of ``union_ids`` in one grouped query."""
+    if not union_ids:
+        return {}
+    rows = db.query(models.UnionMember.union_id, func.count(models.UnionMember.id)).filter(
+        models.UnionMember.union_id.in_(union_ids)
+    ).group_by(models.UnionMember.union_id).all()
+    return dict(rows)
+
+
+def _joined_union_ids(db: Session, user: Optional[Principal], union_ids: List[int]) -> Set[int]:
+    """Subset of ``union_ids`` that ``user`` belongs to, in one IN query."""
+    if user is None or not union_ids:
+        return set()
+    rows = db.query(models.UnionMember.union_id).filter(
+        models.UnionMember.user_id == user.id,
+        models.UnionMember.union_id.in_(union_ids)
+    ).all()
+    return {union_id for union_id, in rows}
+
+
+# Eager loads for embedding posts with their comments and feedback
+UNION_POSTS_LOAD = (
+    selectinload(models.Union.posts).selectinload(models.Post.feedbacks),
+    selectinload(models.Union.posts).selectinload(models.Post.comments).selectinload(models.Comment.user),
+)
+
+
+def _filter_unions(db, query, industry: Optional[str], search: Optional[str], tags: Optional[str], tag_match: str):
+    """Apply list_unions' filters to a Query or select() over Union."""
     # Filter by industry if provided
     if industry:
         query = query.filter(models.Union.industry == industry)
     
-    # Search by name or description if provided
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (models.Union.name.ilike(search_filter)) | 
-            (models.Union.description.ilike(search_filter)) |
-            (models.Union.tags.ilike(search_filter))
-        )
-    
-    unions = query.offset(skip).limit(limit).all()
+    # Exact tag filtering through the (tag, union_id) index
+    wanted_tags = models.normalize_tags(tags)
+    if wanted_tags:
+        tagged = select(models.UnionTag.union_id).where(models.UnionTag.tag.in_(wanted_tags))
+        if tag_match == "all":
+            tagged = tagged.group_by(models.UnionTag.union_id).having(
+                func.count(models.UnionTag.tag) == len(wanted_tags)
+            )
+        query = query.filter(models.Union.id.in_(tagged))
     
-    # Add member count and is_member flag for each union
+    # Search name, description and tags through the full-text index; a
+    # blank search= has no terms and filters nothing
+    search = (search or "").strip()
+    if search:
+        matches = full_text.matching_ids(db, "union", search)
+        if matches is not None:
+            query = query.filter(models.Union.id.in_(matches))
+        else:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (models.Union.name.ilike(search_filter)) | 
+                (models.Union.description.ilike(search_filter)) |
+                (models.Union.tags.ilike(search_filter))
+            )
+    return query
+
+
+def _union_page(unions, include_posts: bool, member_counts: Dict[int, int], joined: Set[int]) -> List[schemas.Union]:
     result = []
     for union in unions:
-        member_count = db.query(func.count(models.UnionMember.id)).filter(
-            models.UnionMember.union_id == union.id
-        ).scalar()
-        
-        # Only check membership if user is authenticated
-        is_member = False
-        if current_user:
-            is_member = db.query(models.UnionMember).filter(
-                models.UnionMember.union_id == union.id,
-                models.UnionMember.user_id == current_user.id
-            ).first() is not None
-        
         union_dict = {
             "id": union.id,
             "name": union.name,
@@ -78,17 +107,52 @@ def list_unions(
             "industry": union.industry,
             "tags": union.tags,
             "created_at": union.created_at,
-            "posts": union.posts,
-            "member_count": member_count,
-            "is_member": is_member
+            "posts": union.posts if include_posts else [],
+            "member_count": member_counts.get(union.id, 0),
+            "is_member": union.id in joined
         }
         result.append(schemas.Union(**union_dict))
-    
     return result
 
 
+@router.get("/", response_model=List[schemas.Union])
+def list_unions(
+    response: Response,
+    skip: int = 0, 
+    limit: int = 100, 
+    cursor: Optional[str] = None,
+    industry: Optional[str] = None,
+    search: Optional[str] = None,
+    tags: Optional[str] = None,
+    tag_match: Literal["any", "all"] = "any",
+    include_posts: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
+):
+    """List unions. Embedded posts are omitted unless include_posts=true.
+
+    tags= filters by a comma-separated tag list; tag_match=any (default)
+    keeps unions with at least one of the tags, tag_match=all only those
+    carrying every tag. search= matches words or word prefixes in the name,
+    description and tags (full-text, see search.py), not arbitrary substrings.
+    """
+    query = db.query(models.Union)
+    if include_posts:
+        query = query.options(*UNION_POSTS_LOAD)
+    query = _filter_unions(db, query, industry, search, tags, tag_match)
+    
+    unions = paginate(query, models.Union.created_at, models.Union.id, cursor, skip, limit).all()
+    set_next_cursor(response, unions, limit, key=lambda u: (u.created_at, u.id))
+    
+    # Member counts and the caller's memberships for the whole page at once
+    union_ids = [u.id for u in unions]
+    member_counts = _member_counts(db, union_ids)
+    joined = _joined_union_ids(db, current_user, union_ids)
+    return _union_page(unions, include_posts, member_counts, joined)
+
+
 @router.get("/industries")
-def list_industries(db: Session = Depends(get_db)):
+def list_industries(db: Session = Depends(get_read_db)):
     """Get all unique industries - no authentication required"""
     industries = db.query(models.Union.industry).distinct().filter(
         models.Union.industry.isnot(None)
@@ -96,28 +160,29 @@ def list_industries(db: Session = Depends(get_db)):
     return [i[0] for i in industries if i[0]]
 
 
-@router.get("/{union_id}", response_model=schemas.Union)
+@router.get("/{union_id}", response_model=typing.Union[schemas.Union, schemas.UnionSummary])
 def get_union(
     union_id: int, 
-    db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(get_current_user_optional)
+    fields: Literal["full", "summary"] = "full",
+    latest: int = Query(5, ge=0, le=50),
+    db: Session = Depends(get_read_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
 ):
-    u = db.query(models.Union).filter(models.Union.id == union_id).first()
+    """Get a union.
+
+    fields=full (default) embeds every post with its comments and feedback;
+    fields=summary returns counts plus the ``latest`` posts as id/title only.
+    """
+    query = db.query(models.Union).filter(models.Union.id == union_id)
+    if fields == "full":
+        query = query.options(*UNION_POSTS_LOAD)
+    u = query.first()
     if not u:
         raise HTTPException(status_code=404, detail="Union not found")
     
     # Add member count and is_member flag
-    member_count = db.query(func.count(models.UnionMember.id)).filter(
-        models.UnionMember.union_id == union_id
-    ).scalar()
-    
-    # Only check membership if user is authenticated
-    is_member = False
-    if current_user:
-        is_member = db.query(models.UnionMember).filter(
-            models.UnionMember.union_id == union_id,
-            models.UnionMember.user_id == current_user.id
-        ).first() is not None
+    member_count = _member_counts(db, [union_id]).get(union_id, 0)
+    is_member = union_id in _joined_union_ids(db, current_user, [union_id])
     
     union_dict = {
         "id": u.id,
@@ -126,19 +191,31 @@ def get_union(
         "industry": u.industry,
         "tags": u.tags,
         "created_at": u.created_at,
-        "posts": u.posts,
         "member_count": member_count,
         "is_member": is_member
     }
     
-    return schemas.Union(**union_dict)
+    if fields == "summary":
+        post_count = db.query(func.count(models.Post.id)).filter(
+            models.Post.union_id == union_id
+        ).scalar()
+        latest_posts = db.query(models.Post.id, models.Post.title).filter(
+            models.Post.union_id == union_id
+        ).order_by(models.Post.created_at.desc(), models.Post.id.desc()).limit(latest).all()
+        return schemas.UnionSummary(
+            **union_dict,
+            post_count=post_count,
+            latest_posts=[schemas.PostRef(id=p.id, title=p.title) for p in latest_posts]
+        )
+    
+    return schemas.Union(**union_dict, posts=u.posts)
 
 
 @router.post("/{union_id}/join")
 def join_union(
     union_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Join a union"""
     # Check if union exists
@@ -159,6 +236,7 @@ def join_union(
     membership = models.UnionMember(union_id=union_id, user_id=current_user.id)
     db.add(membership)
     db.commit()
+    response_cache.invalidate("unions")
     
     return {"message": f"Successfully joined {union.name}"}
 
@@ -167,7 +245,7 @@ def join_union(
 def leave_union(
     union_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Leave a union"""
     # Check if union exists
@@ -187,6 +265,7 @@ def leave_union(
     # Remove membership
     db.delete(membership)
     db.commit()
+    response_cache.invalidate("unions")
     
     return {"message": f"Successfully left {union.name}"}
 
@@ -194,17 +273,23 @@ def leave_union(
 @router.get("/{union_id}/members")
 def get_union_members(
     union_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """Get members of a union"""
     union = db.query(models.Union).filter(models.Union.id == union_id).first()
     if not union:
         raise HTTPException(status_code=404, detail="Union not found")
     
-    members = db.query(models.User).join(models.UnionMember).filter(
-        models.UnionMember.union_id == union_id
-    ).offset(skip).limit(limit).all()
-    
-    return [{"id": m.id, "username": m.username, "role": m.role} for m in members]
+    query = db.query(models.User, models.UnionMember.joined_at, models.UnionMember.id).join(
+        models.UnionMember
+    ).filter(models.UnionMember.union_id == union_id)
+    rows = paginate(
+        query, models.UnionMember.joined_at, models.UnionMember.id, cursor, skip, limit
+    ).all()
+    set_next_cursor(response, rows, limit, key=lambda r: (r.joined_at, r.id))
+
+    return [{"id": m.id, "username": m.username, "role": m.role} for m, _, _ in rows]
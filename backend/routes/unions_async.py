@@ -0,0 +1,128 @@
+"""
+Async read handlers for unions, mounted ahead of unions.router when DB_MODE=async.
+"""
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+
+from .. import models, schemas
+from ..db import get_async_db
+from ..pagination import paginate, set_next_cursor
+from ..security import Principal, get_current_principal_optional
+from .unions import UNION_POSTS_LOAD, _filter_unions, _joined_union_ids, _member_counts, _union_page
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[schemas.Union])
+async def list_unions(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    industry: Optional[str] = None,
+    search: Optional[str] = None,
+    tags: Optional[str] = None,
+    tag_match: Literal["any", "all"] = "any",
+    include_posts: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
+):
+    """List unions. Embedded posts are omitted unless include_posts=true."""
+    statement = select(models.Union)
+    if include_posts:
+        statement = statement.options(*UNION_POSTS_LOAD)
+    statement = _filter_unions(db, statement, industry, search, tags, tag_match)
+
+    unions = (await db.scalars(
+        paginate(statement, models.Union.created_at, models.Union.id, cursor, skip, limit)
+    )).all()
+    set_next_cursor(response, unions, limit, key=lambda u: (u.created_at, u.id))
+
+    union_ids = [u.id for u in unions]
+    member_counts = await db.run_sync(_member_counts, union_ids)
+    joined = await db.run_sync(_joined_union_ids, current_user, union_ids)
+    return _union_page(unions, include_posts, member_counts, joined)
+
+
+@router.get("/industries")
+async def list_industries(db: AsyncSession = Depends(get_async_db)):
+    """Get all unique industries - no authentication required"""
+    industries = await db.scalars(
+        select(models.Union.industry).distinct().where(models.Union.industry.isnot(None))
+    )
+    return [i for i in industries if i]
+
+
+@router.get("/{union_id}", response_model=typing.Union[schemas.Union, schemas.UnionSummary])
+async def get_union(
+    union_id: int,
+    fields: Literal["full", "summary"] = "full",
+    latest: int = Query(5, ge=0, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
+):
+    """Get a union, in full or as a summary (see unions.get_union)."""
+    statement = select(models.Union).where(models.Union.id == union_id)
+    if fields == "full":
+        statement = statement.options(*UNION_POSTS_LOAD)
+    u = await db.scalar(statement)
+    if not u:
+        raise HTTPException(status_code=404, detail="Union not found")
+
+    member_counts = await db.run_sync(_member_counts, [union_id])
+    joined = await db.run_sync(_joined_union_ids, current_user, [union_id])
+    union_dict = {
+        "id": u.id,
+        "name": u.name,
+        "description": u.description,
+        "industry": u.industry,
+        "tags": u.tags,
+        "created_at": u.created_at,
+        "member_count": member_counts.get(union_id, 0),
+        "is_member": union_id in joined
+    }
+
+    if fields == "summary":
+        post_count = await db.scalar(
+            select(func.count(models.Post.id)).where(models.Post.union_id == union_id)
+        )
+        latest_posts = (await db.execute(
+            select(models.Post.id, models.Post.title).where(models.Post.union_id == union_id)
+            .order_by(models.Post.created_at.desc(), models.Post.id.desc()).limit(latest)
+        )).all()
+        return schemas.UnionSummary(
+            **union_dict,
+            post_count=post_count,
+            latest_posts=[schemas.PostRef(id=p.id, title=p.title) for p in latest_posts]
+        )
+
+    return schemas.Union(**union_dict, posts=u.posts)
+
+
+@router.get("/{union_id}/members")
+async def get_union_members(
+    union_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get members of a union"""
+    union = await db.get(models.Union, union_id)
+    if not union:
+        raise HTTPException(status_code=404, detail="Union not found")
+
+    statement = select(models.User, models.UnionMember.joined_at, models.UnionMember.id).join(
+        models.UnionMember
+    ).where(models.UnionMember.union_id == union_id)
+    rows = (await db.execute(paginate(
+        statement, models.UnionMember.joined_at, models.UnionMember.id, cursor, skip, limit
+    ))).all()
+    set_next_cursor(response, rows, limit, key=lambda r: (r.joined_at, r.id))
+
+    return [{"id": m.id, "username": m.username, "role": m.role} for m, _, _ in rows]
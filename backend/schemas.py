@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, ForwardRef
+from typing import Optional, List, Literal, ForwardRef
 import datetime
 
 
@@ -71,6 +71,30 @@ class Post(BaseModel):
         from_attributes = True
 
 
+class PostSparse(BaseModel):
+    """A post trimmed by fields=/expand=; only the requested attributes are present."""
+    id: Optional[int] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    union_id: Optional[int] = None
+    created_at: Optional[datetime.datetime] = None
+    feedbacks: Optional[List[Feedback]] = None
+    comments: Optional[List[Comment]] = None
+    upvotes: Optional[int] = None
+    downvotes: Optional[int] = None
+
+
+class PostVoteCreate(BaseModel):
+    vote_type: Literal["up", "down"]
+
+
+class PostVoteTally(BaseModel):
+    post_id: int
+    vote_type: str
+    upvotes: int
+    downvotes: int
+
+
 class UnionCreate(BaseModel):
     name: str
     description: Optional[str] = None
@@ -93,6 +117,37 @@ class Union(BaseModel):
         from_attributes = True
 
 
+class PostRef(BaseModel):
+    id: int
+    title: str
+
+    class Config:
+        from_attributes = True
+
+
+class UnionSummary(BaseModel):
+    """Union without the embedded post tree; size does not grow with history."""
+    id: int
+    name: str
+    description: Optional[str]
+    industry: Optional[str]
+    tags: Optional[str]
+    created_at: datetime.datetime
+    member_count: int = 0
+    is_member: bool = False
+    post_count: int = 0
+    latest_posts: List[PostRef] = []
+
+
+# Search
+class SearchResult(BaseModel):
+    kind: str  # union | post | comment
+    id: int
+    title: str
+    snippet: str
+    rank: float
+
+
 # Auth & Users
 class UserCreate(BaseModel):
     username: str
@@ -150,6 +205,10 @@ class Event(BaseModel):
         from_attributes = True
 
 
+class EventBulkRSVP(BaseModel):
+    user_ids: List[int]
+
+
 # Polls & Voting
 class PollOptionCreate(BaseModel):
     text: str
@@ -188,10 +247,12 @@ class PollResultOption(BaseModel):
     option_id: int
     text: str
     votes: int
+    percentage: float = 0.0
 
 
 class PollResults(BaseModel):
     poll_id: int
     question: str
+    total_votes: int = 0
     results: List[PollResultOption]
 
@@ -0,0 +1,256 @@
+"""
+Full-text search over unions, posts and comments.
+
+Documents live in a single ``search_index`` table: an FTS5 virtual table on
+SQLite and a table with a generated, GIN-indexed ``tsvector`` on Postgres.
+Each document's id encodes its kind and source row (``ref_id * 4 + kind``),
+so keeping the index in sync is a keyed delete + insert done by mapper
+events inside the same flush as the write that changed the row.
+
+Data written with bulk statements that bypass the ORM (e.g. ``query.delete()``)
+is not tracked; run ``rebuild_search_index.py`` after such changes. At
+startup, ensure_search_index() rebuilds an index that is out of step with
+its tables, so databases upgraded from before search existed work at once.
+
+Matching is by word, not substring: every query term must match the start
+of a word (``ship`` finds "shipping" but ``hipping`` does not), and on
+Postgres terms are stemmed whole words. This replaces the ILIKE substring
+match list_unions' search= used before; the ILIKE scan remains the
+fallback where full-text search is unavailable.
+"""
+import sqlite3
+from typing import List, Optional, Sequence
+
+from sqlalchemy import DDL, Integer, event, text
+from sqlalchemy.orm import Session
+
+from .db import Base
+from . import models
+
+KIND_CODES = {"union": 1, "post": 2, "comment": 3}
+KIND_NAMES = {code: kind for kind, code in KIND_CODES.items()}
+
+
+def _sqlite_has_fts5() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(body)")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+SQLITE_FTS5_AVAILABLE = _sqlite_has_fts5()
+
+
+def search_enabled(dialect_name: str) -> bool:
+    if dialect_name == "sqlite":
+        return SQLITE_FTS5_AVAILABLE
+    return dialect_name == "postgresql"
+
+
+_SQLITE_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index
+    USING fts5(title, body, tokenize = 'porter unicode61')
+"""
+
+_POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS search_index (
+        doc_id BIGINT PRIMARY KEY,
+        title TEXT,
+        body TEXT,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(body, '')), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING GIN (document)",
+]
+
+
+def _sqlite_fts5(ddl, target, bind, **kw):
+    return SQLITE_FTS5_AVAILABLE
+
+
+event.listen(Base.metadata, "after_create", DDL(_SQLITE_DDL).execute_if(dialect="sqlite", callable_=_sqlite_fts5))
+for _statement in _POSTGRES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "before_drop", DDL("DROP TABLE IF EXISTS search_index").execute_if(
+    callable_=lambda ddl, target, bind, **kw: search_enabled(bind.dialect.name)
+))
+
+
+def doc_id(kind: str, ref_id: int) -> int:
+    return ref_id * 4 + KIND_CODES[kind]
+
+
+def _document(target) -> Optional[tuple]:
+    """(kind, title, body) indexed for an ORM object, or None if not searchable."""
+    if isinstance(target, models.Union):
+        body = " ".join(part for part in (target.description, target.tags) if part)
+        return "union", target.name, body
+    if isinstance(target, models.Post):
+        return "post", target.title, target.content
+    if isinstance(target, models.Comment):
+        return "comment", "", target.content
+    return None
+
+
+def _delete_document(connection, kind: str, ref_id: int) -> None:
+    key = "rowid" if connection.dialect.name == "sqlite" else "doc_id"
+    connection.execute(
+        text(f"DELETE FROM search_index WHERE {key} = :doc_id"),
+        {"doc_id": doc_id(kind, ref_id)},
+    )
+
+
+def _index_document(connection, target) -> None:
+    kind, title, body = _document(target)
+    _delete_document(connection, kind, target.id)
+    key = "rowid" if connection.dialect.name == "sqlite" else "doc_id"
+    connection.execute(
+        text(f"INSERT INTO search_index ({key}, title, body) VALUES (:doc_id, :title, :body)"),
+        {"doc_id": doc_id(kind, target.id), "title": title or "", "body": body or ""},
+    )
+
+
+def _after_write(mapper, connection, target):
+    if search_enabled(connection.dialect.name):
+        _index_document(connection, target)
+
+
+def _after_delete(mapper, connection, target):
+    if search_enabled(connection.dialect.name):
+        kind, _, _ = _document(target)
+        _delete_document(connection, kind, target.id)
+
+
+for _model in (models.Union, models.Post, models.Comment):
+    event.listen(_model, "after_insert", _after_write)
+    event.listen(_model, "after_update", _after_write)
+    event.listen(_model, "after_delete", _after_delete)
+
+
+def _fts5_query(q: str) -> str:
+    """Turn free text into a safe FTS5 query: every term, prefix-matched."""
+    terms = [term.replace('"', '""') for term in q.split()]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _kind_filter(column: str, kinds: Optional[Sequence[str]]) -> str:
+    if not kinds:
+        return ""
+    codes = ", ".join(str(KIND_CODES[k]) for k in kinds)
+    return f" AND ({column} % 4) IN ({codes})"
+
+
+def search(db: Session, q: str, kinds: Optional[Sequence[str]] = None, skip: int = 0, limit: int = 20) -> List[dict]:
+    """Ranked matches for ``q``, best first, as dicts of kind/id/title/snippet/rank."""
+    dialect = db.get_bind().dialect.name
+    if not q.strip() or not search_enabled(dialect):
+        return []
+
+    if dialect == "sqlite":
+        rows = db.execute(text(
+            "SELECT rowid AS doc_id, title, "
+            "snippet(search_index, -1, '[', ']', '…', 12) AS snippet, "
+            "bm25(search_index, 10.0, 1.0) AS rank "
+            "FROM search_index WHERE search_index MATCH :q"
+            + _kind_filter("rowid", kinds) +
+            " ORDER BY rank LIMIT :limit OFFSET :skip"
+        ), {"q": _fts5_query(q), "limit": limit, "skip": skip}).all()
+        # bm25() scores are better when lower; flip them so higher is better
+        scored = [(row, -row.rank) for row in rows]
+    else:
+        rows = db.execute(text(
+            "SELECT doc_id, title, "
+            "ts_headline('english', body, query, 'StartSel=[, StopSel=], MaxWords=12, MinWords=4') AS snippet, "
+            "ts_rank(document, query) AS rank "
+            "FROM search_index, plainto_tsquery('english', :q) AS query "
+            "WHERE document @@ query"
+            + _kind_filter("doc_id", kinds) +
+            " ORDER BY rank DESC LIMIT :limit OFFSET :skip"
+        ), {"q": q, "limit": limit, "skip": skip}).all()
+        scored = [(row, row.rank) for row in rows]
+
+    return [
+        {
+            "kind": KIND_NAMES[row.doc_id % 4],
+            "id": row.doc_id // 4,
+            "title": row.title,
+            "snippet": row.snippet,
+            "rank": rank,
+        }
+        for row, rank in scored
+    ]
+
+
+def matching_ids(db: Session, kind: str, q: str):
+    """Subquery of ``kind`` row ids matching ``q``, for use with ``column.in_()``.
+
+    Returns None when full-text search is unavailable so callers can fall
+    back to a LIKE scan. ``q`` must contain at least one term: FTS5 rejects
+    an empty MATCH, so blank queries raise ValueError rather than a 500.
+    """
+    if not q.strip():
+        raise ValueError("search query has no terms")
+    dialect = db.get_bind().dialect.name
+    if not search_enabled(dialect):
+        return None
+    code = KIND_CODES[kind]
+    if dialect == "sqlite":
+        statement = text(
+            "SELECT rowid / 4 AS ref_id FROM search_index "
+            "WHERE search_index MATCH :q AND rowid % 4 = :code"
+        ).bindparams(q=_fts5_query(q), code=code)
+    else:
+        statement = text(
+            "SELECT doc_id / 4 AS ref_id FROM search_index "
+            "WHERE document @@ plainto_tsquery('english', :q) AND doc_id % 4 = :code"
+        ).bindparams(q=q, code=code)
+    return statement.columns(ref_id=Integer)
+
+
+def ensure_search_index(connection) -> bool:
+    """Rebuild the index if its size does not match the indexed tables.
+
+    An empty index over existing rows is what an upgraded database looks
+    like before rebuild_search_index.py has been run. Returns whether a
+    rebuild happened.
+    """
+    if not search_enabled(connection.dialect.name):
+        return False
+    indexed = connection.execute(text("SELECT COUNT(*) FROM search_index")).scalar()
+    expected = connection.execute(text(
+        "SELECT (SELECT COUNT(*) FROM unions) + (SELECT COUNT(*) FROM posts) + (SELECT COUNT(*) FROM comments)"
+    )).scalar()
+    if indexed == expected:
+        return False
+    rebuild_search_index(connection)
+    return True
+
+
+def rebuild_search_index(connection) -> None:
+    """Repopulate the whole index from the unions, posts and comments tables."""
+    if not search_enabled(connection.dialect.name):
+        return
+    key = "rowid" if connection.dialect.name == "sqlite" else "doc_id"
+    connection.execute(text("DELETE FROM search_index"))
+    connection.execute(text(
+        f"INSERT INTO search_index ({key}, title, body) "
+        f"SELECT id * 4 + {KIND_CODES['union']}, name, "
+        "TRIM(COALESCE(description, '') || ' ' || COALESCE(tags, '')) FROM unions"
+    ))
+    connection.execute(text(
+        f"INSERT INTO search_index ({key}, title, body) "
+        f"SELECT id * 4 + {KIND_CODES['post']}, COALESCE(title, ''), COALESCE(content, '') FROM posts"
+    ))
+    connection.execute(text(
+        f"INSERT INTO search_index ({key}, title, body) "
+        f"SELECT id * 4 + {KIND_CODES['comment']}, '', content FROM comments"
+    ))
@@ -1,50 +1,173 @@
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Sequence
 
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 
+from .cache import TTLCache
+from . import hashing
 from .db import get_db
 from . import models
 
 import os
-import bcrypt
 SECRET_KEY = os.getenv("SECRET_KEY") or os.getenv("JWT_SECRET_KEY") or "dev-secret-key-change-me"
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24))
 
-# Use bcrypt directly to avoid passlib compatibility issues
-import bcrypt
+# Decoded token claims and resolved users are cached briefly so hot endpoints
+# skip the JWT signature check and the users query. AUTH_CACHE_TTL=0 disables.
+# It also bounds how stale a token's role claim can be: see _claims_current.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_MAXSIZE = int(os.getenv("AUTH_CACHE_MAXSIZE", "4096"))
+_token_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL)
+_user_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, from token claims checked against the user row."""
+    id: int
+    username: str
+    role: str
+
+
+def _run_hashing(fn, *args):
+    """Run a bcrypt call on the hashing pool, answering 503 when it is saturated."""
+    try:
+        return hashing.run(fn, *args)
+    except hashing.HashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a bcrypt hash"""
     # Truncate password to 72 bytes if needed (bcrypt limitation)
     password_bytes = plain_password.encode('utf-8')[:72]
     hash_bytes = hashed_password.encode('utf-8') if isinstance(hashed_password, str) else hashed_password
-    return bcrypt.checkpw(password_bytes, hash_bytes)
+    return _run_hashing(hashing.check_password_bytes, password_bytes, hash_bytes)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt"""
     # Truncate password to 72 bytes if needed (bcrypt limitation)
     password_bytes = password.encode('utf-8')[:72]
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    hashed = _run_hashing(hashing.hash_password_bytes, password_bytes, hashing.BCRYPT_ROUNDS)
     return hashed.decode('utf-8')
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": int(time.time())})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def _decode_token(token: str) -> dict:
+    """Decode and verify a JWT, reusing the result for repeat tokens until they expire."""
+    payload = _token_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > datetime.utcnow().timestamp():
+        return payload
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if AUTH_CACHE_TTL > 0:
+        _token_cache.set(token, payload)
+    return payload
+
+
+def _load_user(db: Session, username: str) -> Optional[models.User]:
+    """Resolve a username to a User in ``db``, from the cache when possible.
+
+    The cache holds detached snapshots; merge(load=False) attaches a copy to
+    the request's session without emitting any SQL.
+    """
+    snapshot = _user_cache.get(username)
+    if snapshot is not None:
+        return db.merge(snapshot, load=False)
+    user = db.query(models.User).filter(models.User.username == username).first()
+    if user is not None:
+        cache_user(user)
+    return user
+
+
+def cache_user(user: models.User) -> None:
+    """Store a detached snapshot of ``user`` for _load_user (e.g. right after login)."""
+    if AUTH_CACHE_TTL <= 0:
+        return
+    columns = inspect(models.User).column_attrs
+    snapshot = models.User(**{attr.key: getattr(user, attr.key) for attr in columns})
+    make_transient_to_detached(snapshot)
+    _user_cache.set(user.username, snapshot)
+
+
+def clear_auth_cache() -> None:
+    _token_cache.clear()
+    _user_cache.clear()
+
+
+def _claims_current(payload: dict, user: Optional[models.User]) -> bool:
+    """Whether a token's uid/role/ver claims still describe ``user``.
+
+    The user row is the shared source of truth, so a role change or deletion
+    reaches every worker once its cached row expires (AUTH_CACHE_TTL), even
+    when made by a script or plain SQL. A recreated account with a reused id
+    but another username never matches, since the lookup is by ``sub``.
+    """
+    return (
+        user is not None
+        and user.id == payload["uid"]
+        and user.role == payload.get("role")
+        and user.token_version == payload.get("ver", 0)
+    )
+
+
+def _queue_after_commit(target, key: str, value) -> None:
+    # Applied once the change is committed, so no request can re-cache the old row
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(key, set()).add(value)
+
+
+@event.listens_for(models.User, "before_update")
+def _bump_token_version(mapper, connection, target):
+    # Tokens carry the role they were issued with; a role change retires them all
+    if inspect(target).attrs.role.history.deleted:
+        target.token_version = (target.token_version or 0) + 1
+
+
+@event.listens_for(models.User, "after_update")
+def _on_user_update(mapper, connection, target):
+    history = inspect(target).attrs
+    for username in {target.username, *history.username.history.deleted}:
+        _queue_after_commit(target, "evict_usernames", username)
+
+
+@event.listens_for(models.User, "after_delete")
+def _on_user_delete(mapper, connection, target):
+    _queue_after_commit(target, "evict_usernames", target.username)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    for username in session.info.pop("evict_usernames", ()):
+        _user_cache.pop(username)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_evictions(session):
+    session.info.pop("evict_usernames", None)
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,13 +175,13 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = _load_user(db, username)
     if user is None:
         raise credentials_exception
     return user
@@ -85,21 +208,67 @@ def get_current_user_optional(
     token = parts[1]
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             return None
     except JWTError:
         return None
     
-    user = db.query(models.User).filter(models.User.username == username).first()
-    return user
+    return _load_user(db, username)
+
+
+def _principal_from_token(token: str, db: Session) -> Optional[Principal]:
+    """Principal for a token, or None if the token is invalid or revoked.
+
+    Tokens carrying uid/role claims are checked against the cached user row
+    (no query while it is cached); older tokens with only ``sub`` take the
+    role from the user row.
+    """
+    try:
+        payload = _decode_token(token)
+    except JWTError:
+        return None
+    username = payload.get("sub")
+    if username is None:
+        return None
+    user = _load_user(db, username)
+    if user is None:
+        return None
+    if "uid" in payload and not _claims_current(payload, user):
+        return None
+    return Principal(id=user.id, username=user.username, role=user.role)
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    """Authenticated caller from the token alone. Use when id/username/role suffice."""
+    principal = _principal_from_token(token, db)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+def get_current_principal_optional(
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+) -> Optional[Principal]:
+    """Like get_current_user_optional, but returns a Principal without a DB lookup."""
+    if authorization is None:
+        return None
+    parts = authorization.split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return None
+    return _principal_from_token(parts[1], db)
 
 
 def require_roles(roles: Sequence[str]):
-    def _role_checker(user: models.User = Depends(get_current_user)) -> models.User:
-        if user.role not in roles:
+    def _role_checker(principal: Principal = Depends(get_current_principal)) -> Principal:
+        if principal.role not in roles:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
-        return user
+        return principal
 
     return _role_checker
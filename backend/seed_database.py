@@ -19,8 +19,9 @@ import random
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.db import SessionLocal, engine, Base
-from backend.models import User, Union, Post, Comment, Poll, PollOption, Vote, Event, EventAttendee, Feedback, UnionMember, PostVote
+from backend.models import User, Union, Post, Comment, Poll, PollOption, Vote, Event, EventAttendee, Feedback, UnionMember, PostVote, UnionTag
 from backend.security import get_password_hash
+from backend.search import rebuild_search_index
 
 
 def clear_database(db):
@@ -37,7 +38,10 @@ def clear_database(db):
     db.query(Post).delete()
     db.query(UnionMember).delete()
     db.query(User).delete()
+    db.query(UnionTag).delete()
     db.query(Union).delete()
+    # Bulk deletes bypass the ORM hooks that keep the search index in sync
+    rebuild_search_index(db.connection())
     db.commit()
     print("✅ Database cleared!")
 
@@ -0,0 +1,63 @@
+"""
+Pragma profile applied to every SQLite connection.
+
+SQLite's defaults (rollback journal, synchronous=FULL) make each write take
+an exclusive lock that blocks readers and fsync on every commit. The profile
+switches to write-ahead logging, so readers and the single writer no longer
+block each other, and syncs only at checkpoints, which is still safe against
+application crashes. Foreign keys are enforced and lock contention is waited
+out (busy_timeout) instead of failing immediately with "database is locked".
+
+Has no effect on other databases. ``benchmarks/sqlite_pragmas.py`` compares
+concurrent read/write throughput with and without the profile.
+
+Configuration (environment):
+    SQLITE_TUNING        set to 0 to keep SQLite's defaults (default 1)
+    SQLITE_JOURNAL_MODE  journal mode (default WAL)
+    SQLITE_SYNCHRONOUS   OFF, NORMAL, FULL or EXTRA (default NORMAL)
+    SQLITE_MMAP_SIZE     bytes of the file to memory-map (default 268435456)
+    SQLITE_CACHE_SIZE    page cache; negative values are KiB (default -65536)
+    SQLITE_BUSY_TIMEOUT  ms to wait on a locked database (default 5000)
+    SQLITE_FOREIGN_KEYS  enforce foreign keys (default ON)
+"""
+import os
+from typing import Dict
+
+from sqlalchemy import event
+
+_TRUE = {"1", "true", "yes", "on"}
+
+
+def sqlite_pragmas() -> Dict[str, str]:
+    """The pragmas to run on connect, in order, or {} when tuning is disabled."""
+    if os.getenv("SQLITE_TUNING", "1").lower() not in _TRUE:
+        return {}
+    return {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+        "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "ON"),
+    }
+
+
+def configure_sqlite(engine, pragmas: Dict[str, str] = None) -> None:
+    """Run ``pragmas`` (default: the environment's profile) on each new connection of a SQLite engine.
+
+    Accepts sync engines and an AsyncEngine's ``sync_engine``.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
@@ -5,13 +5,16 @@ import os
 import sys
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Cheap bcrypt cost keeps fixtures fast; must be set before the app is imported
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 # Add project root and backend to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.dirname(current_dir)
@@ -25,22 +28,30 @@ for path in [backend_dir, project_root]:
 # Try different import strategies
 try:
     # Try relative import from backend package
-    from backend.db import Base, get_db
+    from backend.db import Base, get_db, get_read_db, get_async_db
     from backend.main import app
+    from backend.routes import build_api_router
+    from backend.sqlite_tuning import configure_sqlite
     from backend.models import User
-    from backend.security import get_password_hash
+    from backend.security import get_password_hash, clear_auth_cache
+    from backend.cache import response_cache
 except ImportError:
     # Fall back to direct import (when running from backend directory)
-    from db import Base, get_db
+    from db import Base, get_db, get_read_db, get_async_db
     from main import app
+    from routes import build_api_router
+    from sqlite_tuning import configure_sqlite
     from models import User
-    from security import get_password_hash
+    from security import get_password_hash, clear_auth_cache
+    from cache import response_cache
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite:///./test_bunch_up.db"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test_bunch_up.db"
 
 # Create test engine and session
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+configure_sqlite(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -66,9 +77,100 @@ def client(test_db):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Each test gets a fresh database, so cached responses and users must not leak across tests
+    response_cache.clear()
+    clear_auth_cache()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    response_cache.clear()
+    clear_auth_cache()
+
+
+@pytest.fixture(scope="function")
+def async_client(client, test_db):
+    """Test client for the API as served with DB_MODE=async.
+
+    Reads covered by the async routers go through an aiosqlite engine on the
+    test database; writes share test_db with ``client``.
+    """
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    # NullPool: the TestClient runs the app on its own event loop
+    async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+    configure_sqlite(async_engine.sync_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.include_router(build_api_router("async"), prefix="/api")
+    async_app.dependency_overrides[get_db] = app.dependency_overrides[get_db]
+    async_app.dependency_overrides[get_read_db] = app.dependency_overrides[get_read_db]
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(async_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="function")
+def query_counter():
+    """Count SQL statements executed against the test database"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+# Threads (and pooled connections) used by the concurrency tests
+CONCURRENCY = 16
+
+
+@pytest.fixture(scope="function")
+def threaded_sessionmaker(tmp_path):
+    """Sessionmaker on a private file database for tests that write from many threads.
+
+    test_db is a single shared session; here every session gets its own
+    pooled connection, so concurrent statements really race in SQLite.
+    """
+    threaded_engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False},
+        pool_size=CONCURRENCY,
+    )
+    configure_sqlite(threaded_engine)
+    Base.metadata.create_all(bind=threaded_engine)
+    yield sessionmaker(bind=threaded_engine)
+    threaded_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def run_concurrently(threaded_sessionmaker):
+    """Call ``fn(db, item)`` for every item from CONCURRENCY threads, each with its own session.
+
+    Returns the results in item order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run(fn, items):
+        def call(item):
+            with threaded_sessionmaker() as db:
+                return fn(db, item)
+
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+            return list(pool.map(call, items))
+
+    return run
 
 
 @pytest.fixture(scope="function")
@@ -200,3 +302,23 @@ def test_post(test_db, test_union):
     test_db.commit()
     test_db.refresh(post)
     return post
+
+
+@pytest.fixture(scope="function")
+def test_event(test_db, test_organizer):
+    """Create a test event starting tomorrow"""
+    from datetime import datetime, timedelta
+    try:
+        from backend.models import Event
+    except ImportError:
+        from models import Event
+
+    event = Event(
+        title="Test Rally",
+        start_time=datetime.utcnow() + timedelta(days=1),
+        creator_id=test_organizer.id
+    )
+    test_db.add(event)
+    test_db.commit()
+    test_db.refresh(event)
+    return event
@@ -0,0 +1,90 @@
+"""
+Tests for the async read handlers served with DB_MODE=async
+"""
+import pytest
+
+
+class TestAsyncReadEndpoints:
+    """The async handlers must answer exactly like their sync counterparts"""
+
+    def assert_same(self, client, async_client, path, **kwargs):
+        sync_response = client.get(path, **kwargs)
+        async_response = async_client.get(path, **kwargs)
+        assert async_response.status_code == sync_response.status_code
+        assert async_response.json() == sync_response.json()
+        assert async_response.headers.get("X-Next-Cursor") == sync_response.headers.get("X-Next-Cursor")
+        return async_response
+
+    def test_posts_match_sync(self, client, async_client, auth_headers_member, test_union, test_post):
+        """Test feed, single post and comments in async mode"""
+        client.post(f"/api/posts/{test_post.id}/comments", json={"content": "First"}, headers=auth_headers_member)
+
+        self.assert_same(client, async_client, f"/api/posts/union/{test_union.id}")
+        self.assert_same(client, async_client, f"/api/posts/union/{test_union.id}?limit=1")
+        self.assert_same(client, async_client, f"/api/posts/union/{test_union.id}?fields=id,title&expand=")
+        self.assert_same(client, async_client, f"/api/posts/{test_post.id}")
+        self.assert_same(client, async_client, f"/api/posts/{test_post.id}?expand=comments")
+        self.assert_same(client, async_client, f"/api/posts/{test_post.id}/comments")
+        self.assert_same(client, async_client, "/api/posts/99999")
+
+    def test_posts_conditional_get(self, client, async_client, test_union, test_post):
+        """Test that the async feed honours ETags computed by the sync handler"""
+        etag = client.get(f"/api/posts/union/{test_union.id}").headers["ETag"]
+        response = async_client.get(f"/api/posts/union/{test_union.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_unions_match_sync(self, client, async_client, auth_headers_member, test_union, test_post):
+        """Test union listings, detail views and members in async mode"""
+        client.post(f"/api/unions/{test_union.id}/join", headers=auth_headers_member)
+
+        self.assert_same(client, async_client, "/api/unions/")
+        self.assert_same(client, async_client, "/api/unions/", headers=auth_headers_member)
+        self.assert_same(client, async_client, "/api/unions/?include_posts=true")
+        self.assert_same(client, async_client, "/api/unions/?search=Workers")
+        self.assert_same(client, async_client, "/api/unions/industries")
+        self.assert_same(client, async_client, f"/api/unions/{test_union.id}", headers=auth_headers_member)
+        self.assert_same(client, async_client, f"/api/unions/{test_union.id}?fields=summary")
+        self.assert_same(client, async_client, f"/api/unions/{test_union.id}/members")
+        self.assert_same(client, async_client, "/api/unions/99999")
+
+    def test_events_match_sync(self, client, async_client, auth_headers_organizer, auth_headers_member):
+        """Test event listings, detail views and attendees in async mode"""
+        created = client.post(
+            "/api/events/",
+            json={"title": "Rally", "start_time": "2030-05-01T12:00:00"},
+            headers=auth_headers_organizer
+        ).json()
+        client.post(f"/api/events/{created['id']}/rsvp", headers=auth_headers_member)
+
+        events = self.assert_same(client, async_client, "/api/events/").json()
+        assert events[0]["attendee_count"] == 1
+        self.assert_same(client, async_client, f"/api/events/{created['id']}")
+        self.assert_same(client, async_client, f"/api/events/{created['id']}/attendees")
+        self.assert_same(client, async_client, "/api/events/99999")
+
+    def test_polls_match_sync(self, client, async_client, auth_headers_organizer, auth_headers_member):
+        """Test poll listings and results in async mode"""
+        poll = client.post(
+            "/api/polls/",
+            json={"question": "Strike?", "options": [{"text": "Yes"}, {"text": "No"}]},
+            headers=auth_headers_organizer
+        ).json()
+        client.post(
+            f"/api/polls/{poll['id']}/vote",
+            json={"option_id": poll["options"][0]["id"]},
+            headers=auth_headers_member
+        )
+
+        self.assert_same(client, async_client, "/api/polls/")
+        self.assert_same(client, async_client, f"/api/polls/{poll['id']}/results")
+
+    def test_writes_fall_through_to_sync_routers(self, async_client, auth_headers_organizer, test_union):
+        """Test that paths without an async handler are still served"""
+        response = async_client.post(
+            f"/api/posts/union/{test_union.id}",
+            json={"title": "Async mode", "content": "Written through the sync router"},
+            headers=auth_headers_organizer
+        )
+        assert response.status_code == 200
+        feed = async_client.get(f"/api/posts/union/{test_union.id}").json()
+        assert any(p["title"] == "Async mode" for p in feed)
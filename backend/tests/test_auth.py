@@ -125,3 +125,150 @@ class TestAuthEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["role"] == "admin"
+
+    def test_repeat_requests_skip_user_lookup(self, client, auth_headers_member, query_counter):
+        """Test that a resolved user is reused across requests"""
+        client.get("/api/auth/me", headers=auth_headers_member)
+        query_counter.clear()
+
+        response = client.get("/api/auth/me", headers=auth_headers_member)
+        assert response.status_code == 200
+        assert response.json()["username"] == "testmember"
+        assert not any("FROM users" in q for q in query_counter)
+
+    def test_role_change_invalidates_cached_user(self, client, test_db, test_user, auth_headers_member):
+        """Test that a committed role change is seen on the next request"""
+        assert client.get("/api/auth/me", headers=auth_headers_member).json()["role"] == "member"
+
+        test_user.role = "organizer"
+        test_db.commit()
+
+        assert client.get("/api/auth/me", headers=auth_headers_member).json()["role"] == "organizer"
+
+    def test_deleted_user_token_rejected(self, client, test_db, test_user, auth_headers_member):
+        """Test that a deleted user's cached entry is dropped"""
+        assert client.get("/api/auth/me", headers=auth_headers_member).status_code == 200
+
+        test_db.delete(test_user)
+        test_db.commit()
+
+        assert client.get("/api/auth/me", headers=auth_headers_member).status_code == 401
+
+    def test_login_returns_503_when_hashing_queue_full(self, client, test_user, monkeypatch):
+        """Test back-pressure when every password hashing slot is taken"""
+        try:
+            from backend import hashing
+        except ImportError:
+            import hashing
+
+        full = hashing.threading.BoundedSemaphore(1)
+        full.acquire()
+        monkeypatch.setattr(hashing, "_slots", full)
+
+        response = client.post(
+            "/api/auth/token",
+            data={"username": "testmember", "password": "testpass123"}
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_token_carries_uid_and_role(self, client, test_user):
+        """Test that access tokens embed the user id and role"""
+        try:
+            from backend.security import SECRET_KEY, ALGORITHM
+        except ImportError:
+            from security import SECRET_KEY, ALGORITHM
+        from jose import jwt
+
+        response = client.post(
+            "/api/auth/token",
+            data={"username": "testmember", "password": "testpass123"}
+        )
+        claims = jwt.decode(response.json()["access_token"], SECRET_KEY, algorithms=[ALGORITHM])
+        assert claims["sub"] == "testmember"
+        assert claims["uid"] == test_user.id
+        assert claims["role"] == "member"
+
+    def test_role_checks_skip_user_lookup(self, client, auth_headers_organizer, query_counter):
+        """Test that role-protected routes authorize from token claims alone"""
+        response = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Claims only?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        )
+        assert response.status_code == 200
+        assert not any("FROM users" in q for q in query_counter)
+
+    def test_role_downgrade_revokes_tokens(self, client, test_db, test_organizer, auth_headers_organizer):
+        """Test that tokens issued before a role change are rejected"""
+        test_organizer.role = "member"
+        test_db.commit()
+
+        response = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Still allowed?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        )
+        assert response.status_code == 401
+
+        fresh = client.post(
+            "/api/auth/token",
+            data={"username": "testorganizer", "password": "organizer123"}
+        ).json()["access_token"]
+        response = client.post(
+            "/api/polls/",
+            headers={"Authorization": f"Bearer {fresh}"},
+            json={"question": "Still allowed?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        )
+        assert response.status_code == 403
+
+    def test_deleted_user_principal_rejected(self, client, test_db, test_user, test_post, auth_headers_member):
+        """Test that a deleted user's claims-only token stops working"""
+        test_db.delete(test_user)
+        test_db.commit()
+
+        response = client.post(
+            f"/api/posts/{test_post.id}/comments",
+            headers=auth_headers_member,
+            json={"content": "Ghost comment"}
+        )
+        assert response.status_code == 401
+
+    def test_role_change_outside_orm_rejects_tokens(self, client, test_db, test_organizer, auth_headers_organizer):
+        """Test that a role changed by plain SQL (e.g. a script) retires old tokens"""
+        from sqlalchemy import text
+        try:
+            from backend.security import clear_auth_cache
+        except ImportError:
+            from security import clear_auth_cache
+
+        test_db.execute(text("UPDATE users SET role = 'member' WHERE id = :id"), {"id": test_organizer.id})
+        test_db.commit()
+        clear_auth_cache()  # stands in for the cached row expiring (AUTH_CACHE_TTL)
+
+        response = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Still allowed?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        )
+        assert response.status_code == 401
+
+    def test_token_for_recreated_user_rejected(self, client, test_db, test_user, test_post, auth_headers_member):
+        """Test that a token does not carry over to a recreated account with another id"""
+        try:
+            from backend.models import User
+        except ImportError:
+            from models import User
+
+        user_id = test_user.id
+        test_db.delete(test_user)
+        test_db.commit()
+        test_db.add(User(id=user_id + 100, username="testmember", hashed_password="x", role="member"))
+        test_db.commit()
+
+        response = client.post(
+            f"/api/posts/{test_post.id}/comments",
+            headers=auth_headers_member,
+            json={"content": "Not mine"}
+        )
+        assert response.status_code == 401
@@ -0,0 +1,79 @@
+"""
+Tests for the anonymous response cache
+"""
+import time
+
+import pytest
+
+try:
+    from backend.cache import TTLCache
+except ImportError:
+    from cache import TTLCache
+
+
+class TestResponseCache:
+    """Test suite for cached read endpoints"""
+
+    def test_repeat_anonymous_get_is_served_from_cache(self, client, test_union):
+        """Test that an identical anonymous request is a cache hit"""
+        first = client.get("/api/unions/?limit=10&skip=0")
+        second = client.get("/api/unions/?skip=0&limit=10")
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert first.json() == second.json()
+
+    def test_write_invalidates_namespace(self, client, auth_headers_organizer, test_union):
+        """Test that creating a post refreshes that union's cached feed"""
+        client.get(f"/api/posts/union/{test_union.id}")
+        client.post(
+            f"/api/posts/union/{test_union.id}",
+            headers=auth_headers_organizer,
+            json={"title": "Fresh", "content": "Just posted"}
+        )
+
+        response = client.get(f"/api/posts/union/{test_union.id}")
+        assert response.headers["X-Cache"] == "MISS"
+        assert [p["title"] for p in response.json()] == ["Fresh"]
+
+    def test_cache_hit_honors_if_none_match(self, client, test_union):
+        """Test that a cached feed answers a matching If-None-Match with 304"""
+        etag = client.get(f"/api/posts/union/{test_union.id}").headers["ETag"]
+        response = client.get(f"/api/posts/union/{test_union.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["X-Cache"] == "HIT"
+
+    def test_authenticated_requests_bypass_cache(self, client, auth_headers_member, test_union):
+        """Test that per-user responses are never cached"""
+        client.get("/api/unions/")
+        response = client.get("/api/unions/", headers=auth_headers_member)
+        assert "X-Cache" not in response.headers
+
+    def test_metrics_report_hits_and_misses(self, client, test_union):
+        """Test that cache counters are exposed"""
+        client.get("/api/unions/industries")
+        client.get("/api/unions/industries")
+
+        stats = client.get("/api/metrics/").json()["response_cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+
+class TestTTLCache:
+    """Test suite for the LRU/TTL store"""
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=2, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
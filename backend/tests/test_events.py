@@ -94,6 +94,26 @@ class TestEventEndpoints:
         data = response.json()
         assert data["end_time"] is None
 
+    def test_create_event_unknown_union(self, client, auth_headers_organizer):
+        """Test that an unknown union_id is a 404, not a foreign key failure"""
+        response = client.post(
+            "/api/events/",
+            headers=auth_headers_organizer,
+            json={"title": "Orphan", "start_time": (datetime.utcnow() + timedelta(days=1)).isoformat(), "union_id": 9999}
+        )
+        assert response.status_code == 404
+
+    def test_update_event_unknown_union(self, client, test_event, auth_headers_organizer):
+        """Test that moving an event to an unknown union is a 404 and changes nothing"""
+        event_id = test_event.id
+        response = client.put(
+            f"/api/events/{event_id}",
+            headers=auth_headers_organizer,
+            json={"title": "Moved", "start_time": (datetime.utcnow() + timedelta(days=1)).isoformat(), "union_id": 9999}
+        )
+        assert response.status_code == 404
+        assert client.get(f"/api/events/{event_id}").json()["title"] == "Test Rally"
+
     def test_create_event_no_union(self, client, auth_headers_organizer):
         """Test creating event without union_id (optional)"""
         start_time = datetime.utcnow() + timedelta(days=1)
@@ -149,6 +169,38 @@ class TestEventEndpoints:
         data = response.json()
         assert len(data) <= 3
 
+    def test_list_events_cursor_pagination(self, client, auth_headers_organizer):
+        """Test walking the event list with next cursors"""
+        start = datetime.utcnow() + timedelta(days=1)
+        for i in range(5):
+            client.post(
+                "/api/events/",
+                headers=auth_headers_organizer,
+                json={
+                    "title": f"Cursor Event {i}",
+                    # Two events share each start time to exercise the id tiebreak
+                    "start_time": (start + timedelta(hours=i // 2)).isoformat()
+                }
+            )
+
+        seen = []
+        url = "/api/events/?limit=2"
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            seen.extend(e["id"] for e in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            url = f"/api/events/?limit=2&cursor={cursor}" if cursor else None
+
+        full = [e["id"] for e in client.get("/api/events/").json()]
+        assert seen == full
+        assert len(seen) == 5
+
+    def test_list_events_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected"""
+        response = client.get("/api/events/?cursor=not-a-cursor")
+        assert response.status_code == 400
+
     def test_list_events_ordered(self, client, auth_headers_organizer):
         """Test that events are ordered by start_time descending"""
         # Create events with different times
@@ -188,3 +240,162 @@ class TestEventEndpoints:
             }
         )
         assert response.status_code == 401
+
+    def test_event_attendees_conditional_get(self, client, test_event, auth_headers_member):
+        """Test attendee list ETags change on RSVP and honor If-None-Match"""
+        event_id = test_event.id
+
+        etag = client.get(f"/api/events/{event_id}/attendees").headers["ETag"]
+        repeat = client.get(f"/api/events/{event_id}/attendees", headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+
+        client.post(f"/api/events/{event_id}/rsvp", headers=auth_headers_member)
+        changed = client.get(f"/api/events/{event_id}/attendees", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["attendee_count"] == 1
+
+    def test_attendee_count_follows_rsvps(self, client, test_event, auth_headers_organizer, auth_headers_member):
+        """Test the maintained attendee_count on RSVP, cancel and list"""
+        event_id = test_event.id
+        assert client.get(f"/api/events/{event_id}").json()["attendee_count"] == 0
+
+        rsvp = client.post(f"/api/events/{event_id}/rsvp", headers=auth_headers_member)
+        assert rsvp.json()["attendee_count"] == 1
+        client.post(f"/api/events/{event_id}/rsvp", headers=auth_headers_organizer)
+        assert client.get(f"/api/events/{event_id}").json()["attendee_count"] == 2
+
+        cancel = client.delete(f"/api/events/{event_id}/rsvp", headers=auth_headers_member)
+        assert cancel.json()["attendee_count"] == 1
+        listed = {e["id"]: e for e in client.get("/api/events/").json()}
+        assert listed[event_id]["attendee_count"] == 1
+
+    def test_list_events_does_not_load_attendees(self, client, test_db, test_organizer, test_user, query_counter):
+        """Test listing events reads counts from the column, not attendee rows"""
+        try:
+            from backend.models import Event, EventAttendee
+        except ImportError:
+            from models import Event, EventAttendee
+
+        for n in range(5):
+            event = Event(title=f"Rally {n}", start_time=datetime.utcnow(), creator_id=test_organizer.id)
+            event.attendees = [EventAttendee(user_id=test_organizer.id), EventAttendee(user_id=test_user.id)]
+            test_db.add(event)
+        test_db.commit()
+
+        query_counter.clear()
+        events = client.get("/api/events/").json()
+        assert [e["attendee_count"] for e in events] == [2] * 5
+        assert not any("FROM event_attendees" in q for q in query_counter)
+
+    def test_event_attendees_paginated(self, client, test_db, test_organizer, query_counter):
+        """Test attendee pages follow the cursor and come from one joined query"""
+        try:
+            from backend.models import Event, EventAttendee, User
+        except ImportError:
+            from models import Event, EventAttendee, User
+
+        users = [User(username=f"attendee{n}", hashed_password="x") for n in range(5)]
+        event = Event(title="Rally", start_time=datetime.utcnow(), creator_id=test_organizer.id)
+        event.attendees = [EventAttendee(user=user) for user in users]
+        test_db.add(event)
+        test_db.commit()
+        event_id = event.id
+
+        query_counter.clear()
+        first = client.get(f"/api/events/{event_id}/attendees?limit=3")
+        assert first.status_code == 200
+        assert first.json()["attendee_count"] == 5
+        assert [a["username"] for a in first.json()["attendees"]] == ["attendee0", "attendee1", "attendee2"]
+        assert len([q for q in query_counter if "JOIN users" in q]) == 1
+        assert not any(q.lstrip().startswith("SELECT users.") for q in query_counter)
+
+        second = client.get(f"/api/events/{event_id}/attendees?limit=3&cursor={first.headers['X-Next-Cursor']}")
+        assert [a["username"] for a in second.json()["attendees"]] == ["attendee3", "attendee4"]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_event_attendees_count_only(self, client, test_event, auth_headers_member):
+        """Test count_only returns the count without listing attendees"""
+        event_id = test_event.id
+        client.post(f"/api/events/{event_id}/rsvp", headers=auth_headers_member)
+
+        response = client.get(f"/api/events/{event_id}/attendees?count_only=true")
+        assert response.json() == {"event_id": event_id, "attendee_count": 1}
+        assert client.get("/api/events/99999/attendees?count_only=true").status_code == 404
+
+
+class TestEventRSVP:
+    """Test suite for RSVP, cancel and bulk RSVP"""
+
+    def test_rsvp_is_idempotent(self, client, test_event, auth_headers_member):
+        for _ in range(2):
+            response = client.post(f"/api/events/{test_event.id}/rsvp", headers=auth_headers_member)
+            assert response.status_code == 200
+            assert response.json()["attendee_count"] == 1
+
+        for _ in range(2):
+            response = client.delete(f"/api/events/{test_event.id}/rsvp", headers=auth_headers_member)
+            assert response.status_code == 200
+            assert response.json()["attendee_count"] == 0
+
+    def test_rsvp_is_single_statement(self, client, test_event, auth_headers_member, query_counter):
+        query_counter.clear()
+        client.post(f"/api/events/{test_event.id}/rsvp", headers=auth_headers_member)
+        writes = [s for s in query_counter if s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+        assert len(writes) == 1
+        assert "ON CONFLICT" in writes[0].upper()
+
+    def test_rsvp_unknown_event(self, client, auth_headers_member):
+        assert client.post("/api/events/99999/rsvp", headers=auth_headers_member).status_code == 404
+        assert client.delete("/api/events/99999/rsvp", headers=auth_headers_member).status_code == 404
+
+    def test_bulk_rsvp(self, client, test_event, test_user, test_admin, auth_headers_organizer, auth_headers_member):
+        client.post(f"/api/events/{test_event.id}/rsvp", headers=auth_headers_member)
+
+        response = client.post(
+            f"/api/events/{test_event.id}/rsvp/bulk",
+            headers=auth_headers_organizer,
+            json={"user_ids": [test_user.id, test_admin.id, test_admin.id, 99999]}
+        )
+        assert response.status_code == 200
+        assert response.json()["added"] == 1
+        assert response.json()["attendee_count"] == 2
+
+        attendees = client.get(f"/api/events/{test_event.id}/attendees").json()["attendees"]
+        assert sorted(a["user_id"] for a in attendees) == sorted([test_user.id, test_admin.id])
+
+    def test_bulk_rsvp_validation(self, client, test_event, auth_headers_organizer, auth_headers_member):
+        url = f"/api/events/{test_event.id}/rsvp/bulk"
+        assert client.post(url, headers=auth_headers_member, json={"user_ids": [1]}).status_code == 403
+        assert client.post(url, headers=auth_headers_organizer, json={"user_ids": []}).status_code == 400
+        assert client.post(url, headers=auth_headers_organizer, json={"user_ids": list(range(1, 1002))}).status_code == 400
+        assert client.post("/api/events/99999/rsvp/bulk", headers=auth_headers_organizer, json={"user_ids": [1]}).status_code == 404
+
+
+class TestRSVPConcurrency:
+    """Parallel double-taps must neither fail nor skew the attendee count"""
+
+    def test_parallel_rsvps(self, threaded_sessionmaker, run_concurrently):
+        try:
+            from backend.models import Event, EventAttendee, User
+            from backend.routes.events import _add_attendees
+        except ImportError:
+            from models import Event, EventAttendee, User
+            from routes.events import _add_attendees
+
+        with threaded_sessionmaker() as db:
+            users = [User(username=f"rsvp{i}", hashed_password="x") for i in range(100)]
+            db.add_all(users)
+            db.flush()
+            event = Event(title="Rally", start_time=datetime.utcnow(), creator_id=users[0].id)
+            db.add(event)
+            db.commit()
+            event_id, user_ids = event.id, [u.id for u in users]
+
+        results = run_concurrently(lambda db, user_id: _add_attendees(db, event_id, [user_id]), user_ids * 5)
+        assert all(r is not None for r in results)
+        assert sum(added for added, _ in results) == len(user_ids)
+
+        with threaded_sessionmaker() as db:
+            rows = db.query(EventAttendee).filter(EventAttendee.event_id == event_id).count()
+            stored = db.query(Event.attendee_count).filter(Event.id == event_id).scalar()
+        assert rows == stored == len(user_ids)
@@ -75,6 +75,15 @@ class TestPollEndpoints:
         assert response.status_code == 400
         assert "at least two options" in response.json()["detail"].lower()
 
+    def test_create_poll_unknown_union(self, client, auth_headers_organizer):
+        """Test that an unknown union_id is a 404, not a foreign key failure"""
+        response = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Orphan?", "union_id": 9999, "options": [{"text": "Yes"}, {"text": "No"}]}
+        )
+        assert response.status_code == 404
+
     def test_create_poll_no_options(self, client, auth_headers_organizer):
         """Test creating poll with no options"""
         response = client.post(
@@ -270,3 +279,154 @@ class TestPollEndpoints:
             json={"option_id": option_id}
         )
         assert vote_response.status_code == 401
+
+    def test_poll_results_conditional_get(self, client, auth_headers_organizer, auth_headers_member):
+        """Test that unchanged results answer If-None-Match with 304"""
+        poll = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "ETag poll?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        ).json()
+
+        first = client.get(f"/api/polls/{poll['id']}/results")
+        etag = first.headers["ETag"]
+        repeat = client.get(f"/api/polls/{poll['id']}/results", headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+
+        client.post(
+            f"/api/polls/{poll['id']}/vote",
+            headers=auth_headers_member,
+            json={"option_id": poll["options"][0]["id"]}
+        )
+        changed = client.get(f"/api/polls/{poll['id']}/results", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()["results"][0]["votes"] == 1
+
+    def test_vote_is_single_statement(self, client, auth_headers_organizer, auth_headers_member, query_counter):
+        """Test that a vote is one conflict-aware insert and tallies are counted in SQL"""
+        poll = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "One statement?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        ).json()
+        query_counter.clear()
+
+        response = client.post(
+            f"/api/polls/{poll['id']}/vote",
+            headers=auth_headers_member,
+            json={"option_id": poll["options"][1]["id"]}
+        )
+        assert response.status_code == 200
+        assert [r["votes"] for r in response.json()["results"]] == [0, 1]
+
+        writes = [s for s in query_counter if s.lstrip().upper().startswith("INSERT")]
+        assert len(writes) == 1
+        assert "ON CONFLICT" in writes[0].upper()
+        # No statement loads individual vote rows
+        assert not any("votes.user_id" in s for s in query_counter)
+
+
+    def test_results_totals_and_percentages(self, client, test_db, auth_headers_organizer, test_user, test_organizer, test_admin, query_counter):
+        """Test that results carry the total and per-option shares from one grouped query"""
+        try:
+            from backend.models import Vote
+        except ImportError:
+            from models import Vote
+
+        poll = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Shares?", "options": [{"text": "A"}, {"text": "B"}, {"text": "C"}]}
+        ).json()
+        a, b, c = (o["id"] for o in poll["options"])
+        test_db.add_all([
+            Vote(poll_id=poll["id"], option_id=a, user_id=test_user.id),
+            Vote(poll_id=poll["id"], option_id=a, user_id=test_organizer.id),
+            Vote(poll_id=poll["id"], option_id=b, user_id=test_admin.id),
+        ])
+        test_db.commit()
+        query_counter.clear()
+
+        data = client.get(f"/api/polls/{poll['id']}/results").json()
+        assert data["total_votes"] == 3
+        assert [(r["option_id"], r["votes"], r["percentage"]) for r in data["results"]] == [
+            (a, 2, 66.7), (b, 1, 33.3), (c, 0, 0.0)
+        ]
+        # ETag marker + the grouped tally
+        assert len(query_counter) == 2
+        assert "GROUP BY" in query_counter[-1].upper()
+
+    def test_vote_by_missing_user(self, client, test_db, auth_headers_organizer):
+        """Test that a foreign key failure on the voter is a 401, not a 500"""
+        from fastapi import HTTPException
+        try:
+            from backend import schemas
+            from backend.routes.polls import vote_poll
+            from backend.security import Principal
+        except ImportError:
+            import schemas
+            from routes.polls import vote_poll
+            from security import Principal
+
+        poll = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Ghost vote?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        ).json()
+        ghost = Principal(id=99999, username="ghost", role="member")
+        with pytest.raises(HTTPException) as error:
+            vote_poll(poll["id"], schemas.VoteCreate(option_id=poll["options"][0]["id"]), test_db, ghost)
+        assert error.value.status_code == 401
+
+    def test_results_without_votes(self, client, auth_headers_organizer):
+        """Test that an empty poll reports zero totals"""
+        poll = client.post(
+            "/api/polls/",
+            headers=auth_headers_organizer,
+            json={"question": "Anyone?", "options": [{"text": "Yes"}, {"text": "No"}]}
+        ).json()
+        data = client.get(f"/api/polls/{poll['id']}/results").json()
+        assert data["total_votes"] == 0
+        assert all(r["votes"] == 0 and r["percentage"] == 0.0 for r in data["results"])
+
+
+class TestPollVoteConcurrency:
+    """uq_poll_user must settle racing votes from the same user"""
+
+    def test_parallel_duplicate_votes(self, threaded_sessionmaker, run_concurrently):
+        from fastapi import HTTPException
+
+        try:
+            from backend import schemas
+            from backend.models import Poll, PollOption, User, Vote
+            from backend.routes.polls import vote_poll
+            from backend.security import Principal
+        except ImportError:
+            import schemas
+            from models import Poll, PollOption, User, Vote
+            from routes.polls import vote_poll
+            from security import Principal
+
+        with threaded_sessionmaker() as db:
+            voter = User(username="racer", hashed_password="x")
+            poll = Poll(question="Race?", options=[PollOption(text="Yes"), PollOption(text="No")])
+            db.add_all([voter, poll])
+            db.commit()
+            principal = Principal(id=voter.id, username=voter.username, role="member")
+            poll_id, option_ids = poll.id, [o.id for o in poll.options]
+
+        def vote(db, n):
+            try:
+                vote_poll(poll_id, schemas.VoteCreate(option_id=option_ids[n % 2]), db, principal)
+                return 200
+            except HTTPException as e:
+                return e.status_code
+
+        statuses = run_concurrently(vote, range(200))
+
+        assert statuses.count(200) == 1
+        assert statuses.count(400) == 199
+        with threaded_sessionmaker() as db:
+            assert db.query(Vote).filter(Vote.poll_id == poll_id).count() == 1
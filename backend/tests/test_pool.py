@@ -0,0 +1,93 @@
+"""
+Tests for connection pool configuration and metrics
+"""
+import pytest
+from sqlalchemy import create_engine, exc
+
+try:
+    from backend.pool import InstrumentedQueuePool, engine_options, pool_stats
+except ImportError:
+    from pool import InstrumentedQueuePool, engine_options, pool_stats
+
+
+class TestEngineOptions:
+    """Test suite for per-backend pool defaults and overrides"""
+
+    def test_postgres_defaults(self, monkeypatch):
+        for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT", "DB_POOL_RECYCLE", "DB_POOL_PRE_PING"):
+            monkeypatch.delenv(name, raising=False)
+        options = engine_options("postgresql://user:pw@db/app")
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_size"] == 10
+        assert options["max_overflow"] == 20
+        assert options["pool_recycle"] == 1800
+        assert options["pool_pre_ping"] is True
+        assert "connect_args" not in options
+
+    def test_sqlite_file_defaults(self, monkeypatch):
+        monkeypatch.delenv("DB_POOL_PRE_PING", raising=False)
+        options = engine_options("sqlite:///./app.db")
+        assert options["connect_args"] == {"check_same_thread": False}
+        assert options["pool_recycle"] == -1
+        assert options["pool_pre_ping"] is False
+
+    def test_sqlite_memory_keeps_default_pool(self):
+        assert "poolclass" not in engine_options("sqlite://")
+        assert "poolclass" not in engine_options("sqlite:///:memory:")
+
+    def test_environment_overrides(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+        options = engine_options("postgresql://user:pw@db/app")
+        assert options["pool_size"] == 3
+        assert options["max_overflow"] == 0
+        assert options["pool_timeout"] == 2.5
+        assert options["pool_pre_ping"] is False
+
+
+class TestPoolMetrics:
+    """Test suite for checkout, wait and timeout counters"""
+
+    def make_engine(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "1")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "0.05")
+        url = f"sqlite:///{tmp_path / 'pool.db'}"
+        return create_engine(url, **engine_options(url))
+
+    def test_counts_checkouts_waits_and_timeouts(self, tmp_path, monkeypatch):
+        engine = self.make_engine(tmp_path, monkeypatch)
+        with engine.connect():
+            stats = pool_stats(engine.pool)
+            assert stats["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        with engine.connect():
+            pass
+
+        stats = pool_stats(engine.pool)
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["waits"] == 1
+        assert stats["wait_ms_max"] >= 40
+        assert stats["checked_out"] == 0
+        engine.dispose()
+
+    def test_metrics_survive_dispose(self, tmp_path, monkeypatch):
+        engine = self.make_engine(tmp_path, monkeypatch)
+        with engine.connect():
+            pass
+        engine.dispose()
+        with engine.connect():
+            pass
+        assert pool_stats(engine.pool)["checkouts"] == 2
+        engine.dispose()
+
+    def test_metrics_endpoint_reports_pool(self, client):
+        """Test that the app's pool is exposed on /api/metrics"""
+        stats = client.get("/api/metrics/").json()["db_pool"]
+        assert stats["pool"] == "InstrumentedQueuePool"
+        assert stats["checkouts"] >= 0
+        assert stats["timeouts"] == 0
@@ -103,6 +103,23 @@ class TestPostEndpoints:
         data = response.json()
         assert len(data) <= 3
 
+    def test_list_posts_cursor_pagination(self, client, auth_headers_organizer, test_union):
+        """Test that cursor pages cover the feed newest first without overlap"""
+        for i in range(5):
+            client.post(
+                f"/api/posts/union/{test_union.id}",
+                headers=auth_headers_organizer,
+                json={"title": f"Post {i}", "content": f"Content {i}"}
+            )
+
+        first = client.get(f"/api/posts/union/{test_union.id}?limit=3")
+        assert [p["title"] for p in first.json()] == ["Post 4", "Post 3", "Post 2"]
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = client.get(f"/api/posts/union/{test_union.id}?limit=3&cursor={cursor}")
+        assert [p["title"] for p in second.json()] == ["Post 1", "Post 0"]
+        assert "X-Next-Cursor" not in second.headers
+
     def test_get_post_by_id(self, client, test_post):
         """Test getting a specific post by ID"""
         response = client.get(f"/api/posts/{test_post.id}")
@@ -141,3 +158,253 @@ class TestPostEndpoints:
         data = response.json()
         assert isinstance(data, list)
         assert len(data) == 0
+
+    def test_list_posts_includes_vote_counts(self, client, test_db, test_union, test_post, test_user, test_organizer):
+        """Test that feed posts carry up/down vote tallies"""
+        try:
+            from backend.models import PostVote
+        except ImportError:
+            from models import PostVote
+
+        test_db.add_all([
+            PostVote(post_id=test_post.id, user_id=test_user.id, vote_type="up"),
+            PostVote(post_id=test_post.id, user_id=test_organizer.id, vote_type="down"),
+        ])
+        test_db.commit()
+
+        response = client.get(f"/api/posts/union/{test_union.id}")
+        assert response.status_code == 200
+        post = next(p for p in response.json() if p["id"] == test_post.id)
+        assert post["upvotes"] == 1
+        assert post["downvotes"] == 1
+
+    def test_vote_counters_follow_vote_writes(self, client, test_db, test_post, test_user, test_organizer):
+        """Test that stored tallies track vote inserts, changes and deletes"""
+        try:
+            from backend.models import PostVote
+        except ImportError:
+            from models import PostVote
+
+        def tallies():
+            data = client.get(f"/api/posts/{test_post.id}").json()
+            return data["upvotes"], data["downvotes"]
+
+        vote = PostVote(post_id=test_post.id, user_id=test_user.id, vote_type="up")
+        test_db.add_all([vote, PostVote(post_id=test_post.id, user_id=test_organizer.id, vote_type="up")])
+        test_db.commit()
+        assert tallies() == (2, 0)
+
+        vote.vote_type = "down"
+        test_db.commit()
+        assert tallies() == (1, 1)
+
+        test_db.delete(vote)
+        test_db.commit()
+        assert tallies() == (1, 0)
+
+    def test_list_posts_query_count_is_constant(self, client, test_db, test_union, test_user, query_counter):
+        """Test that the feed query count does not grow with page size"""
+        try:
+            from backend.models import Post, PostVote, Comment
+        except ImportError:
+            from models import Post, PostVote, Comment
+
+        union_id = test_union.id
+        user_id = test_user.id
+
+        def page_query_count(limit):
+            test_db.expunge_all()
+            query_counter.clear()
+            response = client.get(f"/api/posts/union/{union_id}?limit={limit}")
+            assert response.status_code == 200
+            assert len(response.json()) == limit
+            return len(query_counter)
+
+        for i in range(20):
+            post = Post(title=f"Post {i}", content="Content", union_id=union_id)
+            test_db.add(post)
+            test_db.flush()
+            test_db.add(PostVote(post_id=post.id, user_id=user_id, vote_type="up"))
+            test_db.add(Comment(post_id=post.id, user_id=user_id, content="Comment"))
+        test_db.commit()
+
+        assert page_query_count(2) == page_query_count(20)
+
+    def test_list_posts_sparse_fields(self, client, test_db, test_union, test_post, test_user, query_counter):
+        """Test that fields=/expand= trim the payload and skip relationship loads"""
+        try:
+            from backend.models import Comment
+        except ImportError:
+            from models import Comment
+
+        test_db.add(Comment(post_id=test_post.id, user_id=test_user.id, content="Hidden"))
+        test_db.commit()
+        test_db.expire_all()
+        query_counter.clear()
+
+        response = client.get(
+            f"/api/posts/union/{test_union.id}?fields=id,title,upvotes,downvotes&expand="
+        )
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": test_post.id, "title": "Test Post", "upvotes": 0, "downvotes": 0}
+        ]
+        # No comment or feedback rows are loaded (only the feed version aggregate)
+        assert not any("comments.content" in q or "feedbacks.message" in q for q in query_counter)
+
+    def test_fields_alone_skip_relationships(self, client, test_db, test_post, test_user, query_counter):
+        """Test that fields= without expand= loads only the relationships it names"""
+        try:
+            from backend.models import Comment
+        except ImportError:
+            from models import Comment
+
+        test_db.add(Comment(post_id=test_post.id, user_id=test_user.id, content="Hidden"))
+        test_db.commit()
+        test_db.expire_all()
+        query_counter.clear()
+
+        response = client.get(f"/api/posts/{test_post.id}?fields=upvotes")
+        assert response.status_code == 200
+        assert response.json() == {"upvotes": 0}
+        assert not any("comments.content" in q or "feedbacks.message" in q for q in query_counter)
+
+        # Requests share the test session; forget the unloaded relationship
+        test_db.expire_all()
+        response = client.get(f"/api/posts/{test_post.id}?fields=id,comments")
+        assert set(response.json()) == {"id", "comments"}
+        assert response.json()["comments"][0]["content"] == "Hidden"
+
+    def test_get_post_expand_comments(self, client, test_db, test_post, test_user):
+        """Test expanding only comments on a single post"""
+        try:
+            from backend.models import Comment
+        except ImportError:
+            from models import Comment
+
+        test_db.add(Comment(post_id=test_post.id, user_id=test_user.id, content="Shown"))
+        test_db.commit()
+
+        response = client.get(f"/api/posts/{test_post.id}?expand=comments")
+        assert response.status_code == 200
+        data = response.json()
+        assert "feedbacks" not in data
+        assert data["comments"][0]["content"] == "Shown"
+        assert data["comments"][0]["user"]["username"] == "testmember"
+        assert data["title"] == "Test Post"
+
+    def test_sparse_fields_follow_schema_order(self, client, test_post):
+        """Test that sparse bodies list keys in schema order whatever the request order"""
+        response = client.get(f"/api/posts/{test_post.id}?fields=upvotes,title,id&expand=")
+        assert list(response.json()) == ["id", "title", "upvotes"]
+
+        schema = client.get("/openapi.json").json()["components"]["schemas"]
+        assert "PostSparse" in schema
+
+    def test_get_post_unknown_field(self, client, test_post):
+        """Test that unknown fields are rejected"""
+        response = client.get(f"/api/posts/{test_post.id}?fields=id,secret")
+        assert response.status_code == 400
+
+    def test_list_posts_conditional_get(self, client, auth_headers_member, test_union, test_post):
+        """Test feed ETags change with new activity and honor If-None-Match"""
+        first = client.get(f"/api/posts/union/{test_union.id}")
+        etag = first.headers["ETag"]
+
+        repeat = client.get(f"/api/posts/union/{test_union.id}", headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+
+        # Sparse responses are a different representation with their own tag
+        sparse = client.get(f"/api/posts/union/{test_union.id}?fields=id", headers={"If-None-Match": etag})
+        assert sparse.status_code == 200
+
+        client.post(
+            f"/api/posts/{test_post.id}/comments",
+            headers=auth_headers_member,
+            json={"content": "New activity"}
+        )
+        changed = client.get(f"/api/posts/union/{test_union.id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_vote_post_returns_tallies(self, client, auth_headers_member, auth_headers_organizer, test_post):
+        """Test voting, changing and repeating a vote"""
+        def vote(headers, vote_type):
+            response = client.post(f"/api/posts/{test_post.id}/vote", json={"vote_type": vote_type}, headers=headers)
+            assert response.status_code == 200
+            return response.json()["upvotes"], response.json()["downvotes"]
+
+        assert vote(auth_headers_member, "up") == (1, 0)
+        assert vote(auth_headers_organizer, "down") == (1, 1)
+        assert vote(auth_headers_member, "down") == (0, 2)
+        assert vote(auth_headers_member, "down") == (0, 2)
+
+        post = client.get(f"/api/posts/{test_post.id}").json()
+        assert (post["upvotes"], post["downvotes"]) == (0, 2)
+
+    def test_vote_post_is_single_upsert(self, client, auth_headers_member, test_post, query_counter):
+        """Test that a vote is written with one conflict-aware statement"""
+        client.post(f"/api/posts/{test_post.id}/vote", json={"vote_type": "up"}, headers=auth_headers_member)
+        writes = [s for s in query_counter if s.lstrip().upper().startswith(("INSERT", "UPDATE"))]
+        assert len(writes) == 1
+        assert "ON CONFLICT" in writes[0].upper()
+
+    def test_vote_by_missing_user_is_not_a_missing_post(self, test_db, test_post):
+        """Test that a foreign key failure on the voter is reported as 401, not 404"""
+        from fastapi import HTTPException
+        try:
+            from backend.routes.posts import _cast_vote
+        except ImportError:
+            from routes.posts import _cast_vote
+
+        with pytest.raises(HTTPException) as error:
+            _cast_vote(test_db, test_post.id, 99999, "up")
+        assert error.value.status_code == 401
+        assert _cast_vote(test_db, 99999, 99999, "up") is None
+
+    def test_vote_post_invalid(self, client, auth_headers_member, test_post):
+        """Test voting on a missing post, with a bad vote type and anonymously"""
+        missing = client.post("/api/posts/99999/vote", json={"vote_type": "up"}, headers=auth_headers_member)
+        assert missing.status_code == 404
+        bad_type = client.post(f"/api/posts/{test_post.id}/vote", json={"vote_type": "sideways"}, headers=auth_headers_member)
+        assert bad_type.status_code == 422
+        anonymous = client.post(f"/api/posts/{test_post.id}/vote", json={"vote_type": "up"})
+        assert anonymous.status_code == 401
+
+
+class TestPostVoteConcurrency:
+    """Parallel votes must neither duplicate rows nor skew the counters"""
+
+    def test_thousands_of_parallel_votes(self, threaded_sessionmaker, run_concurrently):
+        import random
+        from sqlalchemy import func
+
+        try:
+            from backend.models import Post, PostVote, Union, User
+            from backend.routes.posts import _cast_vote
+        except ImportError:
+            from models import Post, PostVote, Union, User
+            from routes.posts import _cast_vote
+
+        with threaded_sessionmaker() as db:
+            union = Union(name="Concurrency Union")
+            db.add(union)
+            db.flush()
+            post = Post(title="Hot post", content="Vote on me", union_id=union.id)
+            users = [User(username=f"voter{i}", hashed_password="x") for i in range(200)]
+            db.add_all([post] + users)
+            db.commit()
+            post_id, user_ids = post.id, [u.id for u in users]
+
+        rng = random.Random(42)
+        ballots = [(rng.choice(user_ids), rng.choice(["up", "down"])) for _ in range(2000)]
+
+        results = run_concurrently(lambda db, ballot: _cast_vote(db, post_id, *ballot), ballots)
+        assert all(r is not None for r in results)
+
+        with threaded_sessionmaker() as db:
+            rows = db.query(PostVote).filter(PostVote.post_id == post_id).count()
+            up = db.query(func.count(PostVote.id)).filter(PostVote.post_id == post_id, PostVote.vote_type == "up").scalar()
+            stored = db.query(Post.upvotes, Post.downvotes).filter(Post.id == post_id).one()
+        assert rows == len({user_id for user_id, _ in ballots})
+        assert tuple(stored) == (up, rows - up)
@@ -0,0 +1,85 @@
+"""
+Tests for routing read-only handlers to the read replica
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+try:
+    from backend import db as database
+    from backend.db import Base, ReadSessionLocal, get_read_db
+    from backend.main import app
+    from backend.models import Union
+except ImportError:
+    import db as database
+    from db import Base, ReadSessionLocal, get_read_db
+    from main import app
+    from models import Union
+
+
+@pytest.fixture
+def empty_replica(client, tmp_path):
+    """Point get_read_db at a separate, empty database"""
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=replica_engine)
+    replica = sessionmaker(bind=replica_engine)()
+    app.dependency_overrides[get_read_db] = lambda: replica
+    yield replica
+    replica.close()
+    replica_engine.dispose()
+
+
+class TestReadReplicaRouting:
+    """Reads go to the replica, writes and read-after-write responses to the primary"""
+
+    def test_reads_use_replica(self, client, auth_headers_organizer, test_union, test_post, empty_replica):
+        """Test that list/get endpoints are served from the read session"""
+        assert client.get(f"/api/posts/{test_post.id}").status_code == 404
+        assert client.get(f"/api/unions/{test_union.id}").status_code == 404
+        assert client.get("/api/events/", headers=auth_headers_organizer).json() == []
+        assert client.get("/api/polls/", headers=auth_headers_organizer).json() == []
+
+    def test_writes_use_primary(self, client, auth_headers_organizer, auth_headers_member, test_union, empty_replica):
+        """Test that writes and the results returned by a vote come from the primary"""
+        poll = client.post(
+            "/api/polls/",
+            json={"question": "Strike?", "union_id": test_union.id, "options": [{"text": "Yes"}, {"text": "No"}]},
+            headers=auth_headers_organizer
+        )
+        assert poll.status_code == 200
+        vote = client.post(
+            f"/api/polls/{poll.json()['id']}/vote",
+            json={"option_id": poll.json()["options"][0]["id"]},
+            headers=auth_headers_member
+        )
+        assert vote.status_code == 200
+        assert vote.json()["results"][0]["votes"] == 1
+        # Not replicated to the (fake) replica
+        assert client.get(f"/api/polls/{poll.json()['id']}/results").status_code == 404
+
+    def test_cache_fills_read_primary(self, client, test_db, test_union, tmp_path, monkeypatch):
+        """Test that responses stored in the response cache never come from the replica"""
+        replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=replica_engine)
+        # Exercise get_read_db itself rather than the conftest override
+        del app.dependency_overrides[get_read_db]
+        monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=replica_engine))
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=test_db.get_bind()))
+
+        listed = client.get("/api/unions/")
+        assert listed.headers["X-Cache"] == "MISS"
+        assert [u["id"] for u in listed.json()] == [test_union.id]
+        assert client.get("/api/unions/").headers["X-Cache"] == "HIT"
+        # Uncached reads still go to the (empty) replica
+        assert client.get(f"/api/unions/{test_union.id}").status_code == 404
+        replica_engine.dispose()
+
+    def test_read_session_refuses_writes(self):
+        db = ReadSessionLocal()
+        try:
+            db.add(Union(name="Should not be written"))
+            with pytest.raises(RuntimeError):
+                db.flush()
+        finally:
+            db.rollback()
+            db.close()
@@ -0,0 +1,118 @@
+"""
+Tests for full-text search endpoints
+"""
+import pytest
+
+
+class TestSearchEndpoints:
+    """Test suite for search routes"""
+
+    def test_search_finds_unions_posts_and_comments(self, client, auth_headers_organizer, auth_headers_member):
+        """Test that new unions, posts and comments are searchable"""
+        union = client.post(
+            "/api/unions/",
+            headers=auth_headers_organizer,
+            json={"name": "Nurses Alliance", "description": "Hospital staffing ratios", "tags": "healthcare"}
+        ).json()
+        post = client.post(
+            f"/api/posts/union/{union['id']}",
+            headers=auth_headers_organizer,
+            json={"title": "Staffing survey", "content": "Tell us about night shift staffing"}
+        ).json()
+        client.post(
+            f"/api/posts/{post['id']}/comments",
+            headers=auth_headers_member,
+            json={"content": "Staffing is worst on weekends"}
+        )
+
+        response = client.get("/api/search/?q=staffing")
+        assert response.status_code == 200
+        kinds = {(r["kind"], r["id"]) for r in response.json()}
+        assert ("union", union["id"]) in kinds
+        assert ("post", post["id"]) in kinds
+        assert any(kind == "comment" for kind, _ in kinds)
+
+    def test_search_ranks_title_matches_first(self, client, auth_headers_organizer, test_union):
+        """Test that a title match outranks a body-only match"""
+        for title, content in [("Weekly update", "Contract talks continue"), ("Contract", "Details inside")]:
+            client.post(
+                f"/api/posts/union/{test_union.id}",
+                headers=auth_headers_organizer,
+                json={"title": title, "content": content}
+            )
+
+        results = client.get("/api/search/?q=contract&kinds=post").json()
+        assert [r["title"] for r in results] == ["Contract", "Weekly update"]
+        assert results[0]["rank"] >= results[1]["rank"]
+
+    def test_search_prefix_and_kind_filter(self, client, auth_headers_organizer):
+        """Test prefix matching and restricting results by kind"""
+        client.post(
+            "/api/unions/",
+            headers=auth_headers_organizer,
+            json={"name": "Teachers Federation", "description": "Educators organizing"}
+        )
+
+        assert len(client.get("/api/search/?q=teach&kinds=union").json()) == 1
+        assert client.get("/api/search/?q=teach&kinds=comment").json() == []
+
+    def test_search_removes_deleted_comments(self, client, auth_headers_member, test_post):
+        """Test that deleting a comment drops it from the index"""
+        comment = client.post(
+            f"/api/posts/{test_post.id}/comments",
+            headers=auth_headers_member,
+            json={"content": "Solidarity forever"}
+        ).json()
+        assert len(client.get("/api/search/?q=solidarity").json()) == 1
+
+        client.delete(f"/api/posts/comments/{comment['id']}", headers=auth_headers_member)
+        assert client.get("/api/search/?q=solidarity").json() == []
+
+    def test_search_handles_query_syntax(self, client):
+        """Test that FTS operators in user input do not cause errors"""
+        response = client.get('/api/search/?q="unbalanced AND (')
+        assert response.status_code == 200
+
+    def test_list_unions_blank_search(self, client, test_union):
+        """Test that a whitespace-only search= lists every union instead of failing"""
+        response = client.get("/api/unions/?search=%20%20")
+        assert response.status_code == 200
+        assert [u["name"] for u in response.json()] == [test_union.name]
+
+    def test_search_unknown_kind(self, client):
+        """Test that unknown kinds are rejected"""
+        response = client.get("/api/search/?q=test&kinds=users")
+        assert response.status_code == 400
+
+    def test_list_unions_search_uses_index(self, client, auth_headers_organizer):
+        """Test that the union directory search matches tags and descriptions"""
+        client.post(
+            "/api/unions/",
+            headers=auth_headers_organizer,
+            json={"name": "Dock Workers", "description": "Port logistics", "tags": "shipping,transport"}
+        )
+        client.post(
+            "/api/unions/",
+            headers=auth_headers_organizer,
+            json={"name": "Baristas United", "description": "Coffee shops"}
+        )
+
+        names = [u["name"] for u in client.get("/api/unions/?search=shipping").json()]
+        assert names == ["Dock Workers"]
+
+    def test_empty_index_is_rebuilt(self, client, test_db, test_union):
+        """Test that an index left empty by an upgrade is rebuilt on startup"""
+        from sqlalchemy import text
+        try:
+            from backend.search import ensure_search_index
+        except ImportError:
+            from search import ensure_search_index
+
+        connection = test_db.connection()
+        connection.execute(text("DELETE FROM search_index"))
+
+        assert ensure_search_index(connection) is True
+        assert ensure_search_index(connection) is False
+        test_db.commit()
+        names = [u["name"] for u in client.get("/api/unions/?search=workers").json()]
+        assert names == [test_union.name]
@@ -0,0 +1,52 @@
+"""
+Tests for the SQLite pragma profile
+"""
+import pytest
+from sqlalchemy import create_engine, text
+
+try:
+    from backend.sqlite_tuning import configure_sqlite, sqlite_pragmas
+except ImportError:
+    from sqlite_tuning import configure_sqlite, sqlite_pragmas
+
+
+def pragma(connection, name):
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSqliteTuning:
+    """Test suite for pragmas applied on connect"""
+
+    def test_profile_applied_on_connect(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+        configure_sqlite(engine)
+        with engine.connect() as connection:
+            assert pragma(connection, "journal_mode") == "wal"
+            assert pragma(connection, "synchronous") == 1  # NORMAL
+            assert pragma(connection, "foreign_keys") == 1
+            assert pragma(connection, "busy_timeout") == 5000
+            assert pragma(connection, "cache_size") == -65536
+        engine.dispose()
+
+    def test_environment_overrides(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+        monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "250")
+        engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+        configure_sqlite(engine)
+        with engine.connect() as connection:
+            assert pragma(connection, "synchronous") == 2  # FULL
+            assert pragma(connection, "busy_timeout") == 250
+        engine.dispose()
+
+    def test_tuning_can_be_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SQLITE_TUNING", "0")
+        assert sqlite_pragmas() == {}
+        engine = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+        configure_sqlite(engine)
+        with engine.connect() as connection:
+            assert pragma(connection, "journal_mode") == "delete"
+        engine.dispose()
+
+    def test_test_database_enforces_foreign_keys(self, test_db):
+        """Test that the profile is active on the suite's own engine"""
+        assert pragma(test_db.connection(), "foreign_keys") == 1
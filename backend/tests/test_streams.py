@@ -0,0 +1,212 @@
+"""
+Tests for live update streams (Server-Sent Events)
+"""
+import asyncio
+import json
+
+import pytest
+
+try:
+    from backend.broker import Broker, SlowConsumer, broker
+    from backend.main import app
+except ImportError:
+    from broker import Broker, SlowConsumer, broker
+    from main import app
+
+
+class SSEStream:
+    """Drive the ASGI app directly so events can be read as they are sent.
+
+    TestClient buffers whole response bodies, which never ends for a stream.
+    Leaving the context disconnects the client.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.status = None
+        self.buffer = ""
+        self.chunks: "asyncio.Queue[bytes]" = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+
+    async def __aenter__(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": self.path, "raw_path": self.path.encode(), "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"testserver")],
+            "client": ("testclient", 50000), "server": ("testserver", 80),
+        }
+
+        async def receive():
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                self.status = message["status"]
+            elif message["type"] == "http.response.body":
+                await self.chunks.put(message.get("body", b""))
+
+        self.task = asyncio.create_task(app(scope, receive, send))
+        return self
+
+    async def next_event(self, timeout: float = 5.0):
+        """(event name, data) of the next event, skipping keep-alive comments."""
+        while True:
+            while "\n\n" not in self.buffer:
+                self.buffer += (await asyncio.wait_for(self.chunks.get(), timeout)).decode()
+            raw, self.buffer = self.buffer.split("\n\n", 1)
+            fields = dict(line.split(": ", 1) for line in raw.splitlines() if not line.startswith(":"))
+            if fields:
+                return fields["event"], json.loads(fields["data"])
+
+    async def __aexit__(self, *exc_info):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.fixture
+def poll(client, auth_headers_organizer):
+    return client.post(
+        "/api/polls/",
+        headers=auth_headers_organizer,
+        json={"question": "Live?", "options": [{"text": "Yes"}, {"text": "No"}]}
+    ).json()
+
+
+class TestPollStream:
+    """Test suite for GET /api/polls/{poll_id}/stream"""
+
+    def test_snapshot_then_deltas(self, client, poll, auth_headers_member, monkeypatch):
+        monkeypatch.setattr(broker, "coalesce_window", 0.01)
+        no = poll["options"][1]["id"]
+
+        async def scenario():
+            async with SSEStream(f"/api/polls/{poll['id']}/stream") as stream:
+                event, data = await stream.next_event()
+                assert stream.status == 200
+                assert event == "snapshot"
+                assert data["total_votes"] == 0
+
+                await asyncio.to_thread(
+                    client.post, f"/api/polls/{poll['id']}/vote",
+                    headers=auth_headers_member, json={"option_id": no}
+                )
+                event, data = await stream.next_event()
+                assert event == "delta"
+                assert data["total_votes"] == 1
+                assert [(c["option_id"], c["votes"], c["delta"]) for c in data["changes"]] == [(no, 1, 1)]
+
+        asyncio.run(scenario())
+        assert not broker.has_subscribers(f"poll:{poll['id']}")
+
+    def test_bursts_are_coalesced(self, client, poll, auth_headers_member, auth_headers_admin, monkeypatch):
+        monkeypatch.setattr(broker, "coalesce_window", 1.0)
+        yes = poll["options"][0]["id"]
+
+        async def scenario():
+            async with SSEStream(f"/api/polls/{poll['id']}/stream") as stream:
+                await stream.next_event()
+                for headers in (auth_headers_member, auth_headers_admin):
+                    await asyncio.to_thread(
+                        client.post, f"/api/polls/{poll['id']}/vote", headers=headers, json={"option_id": yes}
+                    )
+                event, data = await stream.next_event()
+                assert event == "delta"
+                assert data["total_votes"] == 2
+                assert data["changes"][0]["delta"] == 2
+
+        coalesced = broker.coalesced
+        asyncio.run(scenario())
+        assert broker.coalesced == coalesced + 1
+
+    def test_unknown_poll(self, client):
+        response = client.get("/api/polls/99999/stream")
+        assert response.status_code == 404
+        assert not broker.has_subscribers("poll:99999")
+
+    def test_publish_without_subscribers_is_noop(self):
+        published = broker.published
+        broker.publish("poll:424242", {"ignored": True}, coalesce_key="results")
+        assert broker.published == published
+
+
+class TestPostStream:
+    """Test suite for GET /api/posts/{post_id}/stream"""
+
+    def test_comments_are_pushed(self, client, test_post, auth_headers_member):
+        post_id = test_post.id
+
+        async def scenario():
+            async with SSEStream(f"/api/posts/{post_id}/stream") as stream:
+                event, data = await stream.next_event()
+                assert stream.status == 200
+                assert (event, data) == ("snapshot", {"post_id": post_id, "upvotes": 0, "downvotes": 0})
+
+                created = (await asyncio.to_thread(
+                    client.post, f"/api/posts/{post_id}/comments",
+                    headers=auth_headers_member, json={"content": "First!"}
+                )).json()
+                event, data = await stream.next_event()
+                assert event == "comment_created"
+                assert data["id"] == created["id"]
+                assert data["user"]["username"] == created["user"]["username"]
+
+                await asyncio.to_thread(
+                    client.put, f"/api/posts/comments/{created['id']}",
+                    headers=auth_headers_member, json={"content": "Edited"}
+                )
+                event, data = await stream.next_event()
+                assert (event, data["content"]) == ("comment_updated", "Edited")
+
+                await asyncio.to_thread(
+                    client.delete, f"/api/posts/comments/{created['id']}", headers=auth_headers_member
+                )
+                event, data = await stream.next_event()
+                assert (event, data) == ("comment_deleted", {"id": created["id"], "post_id": post_id})
+
+        asyncio.run(scenario())
+        assert not broker.has_subscribers(f"post:{post_id}")
+
+    def test_vote_tallies_are_coalesced(self, client, test_post, auth_headers_member, auth_headers_admin, monkeypatch):
+        monkeypatch.setattr(broker, "coalesce_window", 1.0)
+        post_id = test_post.id
+
+        async def scenario():
+            async with SSEStream(f"/api/posts/{post_id}/stream") as stream:
+                await stream.next_event()
+                for headers, vote_type in ((auth_headers_member, "up"), (auth_headers_admin, "down")):
+                    await asyncio.to_thread(
+                        client.post, f"/api/posts/{post_id}/vote", headers=headers, json={"vote_type": vote_type}
+                    )
+                event, data = await stream.next_event()
+                assert (event, data) == ("votes", {"post_id": post_id, "upvotes": 1, "downvotes": 1})
+
+        asyncio.run(scenario())
+
+    def test_unknown_post(self, client):
+        response = client.get("/api/posts/99999/stream")
+        assert response.status_code == 404
+        assert not broker.has_subscribers("post:99999")
+
+
+class TestSlowConsumer:
+    """Bounded per-subscriber buffers"""
+
+    def test_full_buffer_drops_subscriber(self):
+        local = Broker()
+
+        async def scenario():
+            slow = local.subscribe("post:1", maxsize=2)
+            fast = local.subscribe("post:1", maxsize=2)
+            for n in range(3):
+                local.publish("post:1", n)
+                await asyncio.sleep(0)
+                assert await fast.get() == n
+            assert local.has_subscribers("post:1")
+            assert slow.queue.qsize() == 1  # only the close marker is kept
+            with pytest.raises(SlowConsumer):
+                await slow.get()
+
+        asyncio.run(scenario())
+        assert local.stats()["dropped"] == 1
+        assert local.stats()["subscribers"] == 1
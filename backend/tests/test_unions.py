@@ -138,3 +138,119 @@ class TestUnionEndpoints:
         data = response.json()
         assert "posts" in data
         assert isinstance(data["posts"], list)
+
+    def test_list_unions_member_counts_and_membership(self, client, auth_headers_member, test_db, test_union, test_user):
+        """Test that member counts and is_member are reported per union"""
+        try:
+            from backend.models import Union, UnionMember
+        except ImportError:
+            from models import Union, UnionMember
+
+        other = Union(name="Other Union")
+        test_db.add(other)
+        test_db.commit()
+        test_db.add(UnionMember(union_id=test_union.id, user_id=test_user.id))
+        test_db.commit()
+
+        response = client.get("/api/unions/", headers=auth_headers_member)
+        assert response.status_code == 200
+        by_name = {u["name"]: u for u in response.json()}
+        assert by_name["Test Workers Union"]["member_count"] == 1
+        assert by_name["Test Workers Union"]["is_member"] is True
+        assert by_name["Other Union"]["member_count"] == 0
+        assert by_name["Other Union"]["is_member"] is False
+        assert by_name["Test Workers Union"]["posts"] == []
+
+    def test_list_unions_include_posts(self, client, test_union, test_post):
+        """Test that embedded posts are returned only when requested"""
+        response = client.get("/api/unions/?include_posts=true")
+        assert response.status_code == 200
+        union = next(u for u in response.json() if u["id"] == test_union.id)
+        assert [p["title"] for p in union["posts"]] == ["Test Post"]
+
+    def test_list_unions_query_count_is_constant(self, client, auth_headers_member, test_db, test_user, query_counter):
+        """Test that the directory query count does not grow with page size"""
+        try:
+            from backend.models import Union, UnionMember
+        except ImportError:
+            from models import Union, UnionMember
+
+        for i in range(10):
+            union = Union(name=f"Directory Union {i}")
+            test_db.add(union)
+            test_db.flush()
+            test_db.add(UnionMember(union_id=union.id, user_id=test_user.id))
+        test_db.commit()
+
+        def page_query_count(limit):
+            test_db.expire_all()
+            query_counter.clear()
+            response = client.get(f"/api/unions/?limit={limit}", headers=auth_headers_member)
+            assert response.status_code == 200
+            assert len(response.json()) == limit
+            return len(query_counter)
+
+        client.get("/api/unions/", headers=auth_headers_member)  # warm the auth cache
+        assert page_query_count(2) == page_query_count(10)
+
+    def test_get_union_summary(self, client, test_db, test_union, test_post):
+        """Test the summary representation omits the embedded post tree"""
+        try:
+            from backend.models import Post
+        except ImportError:
+            from models import Post
+
+        test_db.add(Post(title="Newer Post", content="Newer", union_id=test_union.id))
+        test_db.commit()
+
+        response = client.get(f"/api/unions/{test_union.id}?fields=summary&latest=1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "Test Workers Union"
+        assert data["post_count"] == 2
+        assert data["latest_posts"] == [{"id": data["latest_posts"][0]["id"], "title": "Newer Post"}]
+        assert "posts" not in data
+
+    def test_get_union_invalid_fields(self, client, test_union):
+        """Test that an unknown representation is rejected"""
+        response = client.get(f"/api/unions/{test_union.id}?fields=everything")
+        assert response.status_code == 422
+
+    def test_list_unions_filter_by_tags(self, client, auth_headers_organizer):
+        """Test exact tag filtering with any/all semantics"""
+        for name, tags in [
+            ("Nurses United", "Healthcare, Nurses"),
+            ("Hospital Porters", "healthcare,logistics"),
+            ("Truckers Guild", "logistics"),
+        ]:
+            client.post(
+                "/api/unions/",
+                headers=auth_headers_organizer,
+                json={"name": name, "tags": tags}
+            )
+
+        def names(query):
+            response = client.get(f"/api/unions/?{query}")
+            assert response.status_code == 200
+            return sorted(u["name"] for u in response.json())
+
+        assert names("tags=healthcare") == ["Hospital Porters", "Nurses United"]
+        assert names("tags=nurses,logistics") == ["Hospital Porters", "Nurses United", "Truckers Guild"]
+        assert names("tags=healthcare,logistics&tag_match=all") == ["Hospital Porters"]
+        # Tags match exactly, not as substrings
+        assert names("tags=care") == []
+
+    def test_union_tags_follow_tag_updates(self, test_db, test_union):
+        """Test that reassigning Union.tags rewrites its tag rows"""
+        try:
+            from backend.models import UnionTag
+        except ImportError:
+            from models import UnionTag
+
+        test_union.tags = "Education, teachers, education"
+        test_db.commit()
+        test_union.tags = "teachers,staff"
+        test_db.commit()
+
+        tags = sorted(t.tag for t in test_db.query(UnionTag).filter(UnionTag.union_id == test_union.id))
+        assert tags == ["staff", "teachers"]
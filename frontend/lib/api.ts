@@ -149,11 +149,13 @@ export interface PollResultOption {
   option_id: number;
   text: string;
   votes: number;
+  percentage?: number;
 }
 
 export interface PollResults {
   poll_id: number;
   question: string;
+  total_votes?: number;
   results: PollResultOption[];
 }
 